@@ -5,19 +5,20 @@
 .. codeauthor:: Raymond Ehlers <raymond.ehlers@cern.ch>, Yale University
 """
 
+import contextlib
 import copy
 import dataclasses
 from dataclasses import dataclass
 import enum
+import functools
 import inspect
-import IPython
+import io
 import logging
 import os
 import numpy as np
 import sys
-from joblib import Memory
 from pathlib import Path
-from typing import Any, cast, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+from typing import Any, Callable, cast, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 # NOTE: This is out of the expected order, but it must be here to prevent ROOT from stealing the command
 #       line options
@@ -27,7 +28,6 @@ import pachyderm.fit
 from pachyderm import histogram
 from pachyderm import projectors
 from pachyderm.projectors import HistAxisRange
-from pachyderm import utils
 from pachyderm.utils import epsilon
 from pachyderm import yaml
 
@@ -63,9 +63,6 @@ this_module = sys.modules[__name__]
 # Typing helpers
 ProcessingOptions = Dict[str, bool]
 
-# Setup memory cache
-memory = Memory("mem_cache", verbose = 0)
-
 class JetHCorrelationSparse(enum.Enum):
     """ Defines the axes in the Jet-Hadron THn Sparses. """
     centrality = 0
@@ -122,6 +119,19 @@ class JetHCorrelationProjector(projectors.HistProjector):
         """ Retrieve the histogram from the observable. """
         return observable.hist
 
+# Figure templates. The leading spaces are removed once here rather than each time that a figure is generated.
+_markdown_figure_template = inspect.cleandoc("""
+    ![{caption}]({path}.{extension}){{#fig:{label} width="{width}%"}}
+""")
+_latex_figure_template = inspect.cleandoc(r"""
+    \begin{figure}
+        \centering
+        \includegraphics[width=.9\textwidth]{images/%(hist_path)s.eps}
+        \caption{%(caption)s}
+        \label{fig:%(label)s}
+    \end{figure}
+""")
+
 @dataclass
 class MarkdownFigure:
     figure_name: str
@@ -131,13 +141,7 @@ class MarkdownFigure:
     extension: str = "pdf"
 
     def generate_from_template(self, base_path: Path) -> str:
-        figure_template = """
-        ![{caption}]({path}.{extension}){{#fig:{label} width="{width}%"}}
-        """
-        # Remove the leading spaces
-        figure_template = inspect.cleandoc(figure_template)
-
-        figure = figure_template.format(
+        figure = _markdown_figure_template.format(
             caption = self.caption,
             path = base_path / self.figure_name,
             label = self.label,
@@ -147,6 +151,19 @@ class MarkdownFigure:
 
         return figure
 
+@dataclass
+class LaTeXFigure:
+    path: str
+    label: str
+    caption: str
+
+    def generate_figure(self) -> str:
+        """ Generate the LaTeX figure from the provided values. """
+        return _latex_figure_template % {
+            "hist_path": os.path.join(self.path, self.label), "label": self.label,
+            "caption": self.caption,
+        }
+
 class PlotGeneralHistograms(generic_tasks.PlotTaskHists):
     """ Task to plot general task hists, such as centrality, Z vertex, very basic QA spectra, etc.
 
@@ -184,6 +201,29 @@ class GeneralHistogramsManager(generic_tasks.TaskManager):
             obj = PlotGeneralHistograms,
         )
 
+_T_Field = TypeVar("_T_Field")
+
+@functools.lru_cache()
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """ Retrieve the names of the fields of a dataclass.
+
+    Args:
+        cls: Dataclass type.
+    Returns:
+        Names of the fields, in the order in which they were defined.
+    """
+    return tuple(f.name for f in dataclasses.fields(cls))
+
+class _IterableFields(Generic[_T_Field]):
+    """ Mixin to iterate over the fields of a dataclass as ``(name, value)`` pairs.
+
+    Note:
+        ``dataclasses.asdict(...)`` is recursive, so it's far too aggressive for our purposes!
+    """
+    def __iter__(self) -> Iterator[Tuple[str, _T_Field]]:
+        for name in _field_names(type(self)):
+            yield name, getattr(self, name)
+
 @dataclass
 class CorrelationObservable2D(analysis_objects.Observable):
     type: str
@@ -206,17 +246,11 @@ _2d_correlations_histogram_information = {
 }
 
 @dataclass
-class CorrelationHistograms2D:
+class CorrelationHistograms2D(_IterableFields[CorrelationObservable2D]):
     raw: CorrelationObservable2D
     mixed_event: CorrelationObservable2D
     signal: CorrelationObservable2D
 
-    def __iter__(self) -> Iterator[Tuple[str, Hist]]:
-        # NOTE: dataclasses.asdict(...) is recursive, so it's far
-        #       too aggressive for our purposes!
-        for k, v in vars(self).items():
-            yield k, v
-
 @dataclass
 class NumberOfTriggersObservable(analysis_objects.Observable):
     """ Simple container for the spectra used to determine the number of triggers.
@@ -239,6 +273,8 @@ class CorrelationObservable1D(analysis_objects.Observable):
     type: analysis_objects.CorrelationType
     axis: analysis_objects.CorrelationAxis
     analysis_identifier: Optional[str] = None
+    # True if the observable stores the background subtracted correlation.
+    subtracted: bool = False
 
     @property
     def name(self) -> str:
@@ -246,7 +282,10 @@ class CorrelationObservable1D(analysis_objects.Observable):
         analysis_identifier = self.analysis_identifier
         if self.analysis_identifier is None:
             analysis_identifier = "{analysis_identifier}"
-        return f"jetH_{self.axis}_{analysis_identifier}_{self.type}"
+        name = f"jetH_{self.axis}_{analysis_identifier}_{self.type}"
+        if self.subtracted:
+            name += "_subtracted"
+        return name
 
 @dataclass
 class DeltaPhiObservable(CorrelationObservable1D):
@@ -260,26 +299,6 @@ class DeltaPhiSignalDominated(DeltaPhiObservable):
 class DeltaPhiBackgroundDominated(DeltaPhiObservable):
     type: analysis_objects.CorrelationType = analysis_objects.CorrelationType.background_dominated
 
-@dataclass
-class DeltaPhiSignalDominatedSubtracted(DeltaPhiSignalDominated):
-    @property
-    def name(self) -> str:
-        # If the analysis identifier isn't specified, we preserved the field for it to be filled in later.
-        analysis_identifier = self.analysis_identifier
-        if self.analysis_identifier is None:
-            analysis_identifier = "{analysis_identifier}"
-        return f"jetH_{self.axis}_{analysis_identifier}_{self.type}_subtracted"
-
-@dataclass
-class DeltaPhiBackgroundDominatedSubtracted(DeltaPhiBackgroundDominated):
-    @property
-    def name(self) -> str:
-        # If the analysis identifier isn't specified, we preserved the field for it to be filled in later.
-        analysis_identifier = self.analysis_identifier
-        if self.analysis_identifier is None:
-            analysis_identifier = "{analysis_identifier}"
-        return f"jetH_{self.axis}_{analysis_identifier}_{self.type}_subtracted"
-
 @dataclass
 class DeltaEtaObservable(CorrelationObservable1D):
     axis: analysis_objects.CorrelationAxis = analysis_objects.CorrelationAxis.delta_eta
@@ -292,89 +311,87 @@ class DeltaEtaNearSide(DeltaEtaObservable):
 class DeltaEtaAwaySide(DeltaEtaObservable):
     type: analysis_objects.CorrelationType = analysis_objects.CorrelationType.away_side
 
-@dataclass
-class DeltaEtaNearSideSubtracted(DeltaEtaNearSide):
-    @property
-    def name(self) -> str:
-        # If the analysis identifier isn't specified, we preserved the field for it to be filled in later.
-        analysis_identifier = self.analysis_identifier
-        if self.analysis_identifier is None:
-            analysis_identifier = "{analysis_identifier}"
-        return f"jetH_{self.axis}_{analysis_identifier}_{self.type}_subtracted"
-
-@dataclass
-class DeltaEtaAwaySideSubtracted(DeltaEtaAwaySide):
-    @property
-    def name(self) -> str:
-        # If the analysis identifier isn't specified, we preserved the field for it to be filled in later.
-        analysis_identifier = self.analysis_identifier
-        if self.analysis_identifier is None:
-            analysis_identifier = "{analysis_identifier}"
-        return f"jetH_{self.axis}_{analysis_identifier}_{self.type}_subtracted"
-
 _1d_correlations_histogram_information: Mapping[str, CorrelationObservable1D] = {
     "correlation_hists_delta_phi.signal_dominated": DeltaPhiSignalDominated(hist = None),
     "correlation_hists_delta_phi.background_dominated": DeltaPhiBackgroundDominated(hist = None),
-    "correlation_hists_delta_phi_subtracted.signal_dominated": DeltaPhiSignalDominatedSubtracted(hist = None),
-    "correlation_hists_delta_phi_subtracted.background_dominated": DeltaPhiBackgroundDominatedSubtracted(hist = None),
+    "correlation_hists_delta_phi_subtracted.signal_dominated": DeltaPhiSignalDominated(hist = None, subtracted = True),
+    "correlation_hists_delta_phi_subtracted.background_dominated": DeltaPhiBackgroundDominated(hist = None, subtracted = True),
     "correlation_hists_delta_eta.near_side": DeltaEtaNearSide(hist = None),
     "correlation_hists_delta_eta.away_side": DeltaEtaAwaySide(hist = None),
-    "correlation_hists_delta_eta_subtracted.near_side": DeltaEtaNearSideSubtracted(hist = None),
-    "correlation_hists_delta_eta_subtracted.away_side": DeltaEtaAwaySideSubtracted(hist = None),
+    "correlation_hists_delta_eta_subtracted.near_side": DeltaEtaNearSide(hist = None, subtracted = True),
+    "correlation_hists_delta_eta_subtracted.away_side": DeltaEtaAwaySide(hist = None, subtracted = True),
+}
+
+# All of the histogram information, merged once so that it doesn't need to be recreated when iterating.
+_all_histogram_information: Mapping[str, analysis_objects.Observable] = {
+    **_2d_correlations_histogram_information,
+    **_number_of_triggers_histogram_information,
+    **_1d_correlations_histogram_information,
+}
+
+# Map from our event plane orientations to the names used in Joel's comparison hists.
+# It's defined by hand because the names are out of our control.
+_map_to_joels_hist_names: Mapping[params.ReactionPlaneOrientation, str] = {
+    params.ReactionPlaneOrientation.inclusive: "all",
+    params.ReactionPlaneOrientation.in_plane: "in",
+    params.ReactionPlaneOrientation.mid_plane: "mid",
+    params.ReactionPlaneOrientation.out_of_plane: "out",
 }
 
+_T_Observable = TypeVar("_T_Observable", bound = Union[CorrelationObservable1D, CorrelationObservable2D])
+
+def _copy_observable(observable: _T_Observable, analysis_identifier: str) -> _T_Observable:
+    """ Create a copy of an observable prototype for a particular analysis.
+
+    Args:
+        observable: Observable prototype to be copied.
+        analysis_identifier: Identifier of the analysis which will own the copy.
+    Returns:
+        Copy of the observable with the analysis identifier set.
+    """
+    new_observable = copy.copy(observable)
+    new_observable.analysis_identifier = analysis_identifier
+    return new_observable
+
 @dataclass
-class CorrelationHistogramsDeltaPhi:
+class CorrelationHistogramsDeltaPhi(_IterableFields[DeltaPhiObservable]):
     signal_dominated: DeltaPhiSignalDominated
     background_dominated: DeltaPhiBackgroundDominated
 
-    def __iter__(self) -> Iterator[Tuple[str, DeltaPhiObservable]]:
-        # NOTE: dataclasses.asdict(...) is recursive, so it's far
-        #       too aggressive for our purposes!
-        for k, v in vars(self).items():
-            yield k, v
-
 @dataclass
-class CorrelationHistogramsDeltaEta:
+class CorrelationHistogramsDeltaEta(_IterableFields[DeltaEtaObservable]):
     near_side: DeltaEtaNearSide
     away_side: DeltaEtaAwaySide
 
-    def __iter__(self) -> Iterator[Tuple[str, DeltaEtaObservable]]:
-        # NOTE: dataclasses.asdict(...) is recursive, so it's far
-        #       too aggressive for our purposes!
-        for k, v in vars(self).items():
-            yield k, v
-
 @dataclass
-class DeltaEtaFitObjects:
+class DeltaEtaFitObjects(_IterableFields[fitting.PedestalForDeltaEtaBackgroundDominatedRegion]):
     near_side: fitting.PedestalForDeltaEtaBackgroundDominatedRegion
     away_side: fitting.PedestalForDeltaEtaBackgroundDominatedRegion
 
-    def __iter__(self) -> Iterator[Tuple[str, fitting.PedestalForDeltaEtaBackgroundDominatedRegion]]:
-        for k, v in vars(self).items():
-            yield k, v
-
 @dataclass
-class CorrelationYields:
+class CorrelationYields(_IterableFields[extracted.ExtractedYield]):
     near_side: extracted.ExtractedYield
     away_side: extracted.ExtractedYield
 
-    def __iter__(self) -> Iterator[Tuple[str, extracted.ExtractedYield]]:
-        for k, v in vars(self).items():
-            yield k, v
-
 @dataclass
-class CorrelationWidths:
+class CorrelationWidths(_IterableFields[extracted.ExtractedWidth]):
     near_side: extracted.ExtractedWidth
     away_side: extracted.ExtractedWidth
 
-    def __iter__(self) -> Iterator[Tuple[str, extracted.ExtractedWidth]]:
-        for k, v in vars(self).items():
-            yield k, v
+# Map from the width attribute names to the short names used for the RP fit parameters.
+# For example, "near_side" -> "ns".
+_rpf_parameter_short_names: Mapping[str, str] = {
+    name: "".join([s[0] for s in name.split("_")]) for name in _field_names(CorrelationWidths)
+}
 
+@functools.lru_cache(maxsize = 1)
 def _setup_yaml() -> yaml.ruamel.yaml.YAML:
     """ Setup YAML object with the registration of the required classes.
 
+    Note:
+        Registering the modules requires registering every class that they contain, so we only
+        want to do it once. The object is cached and shared by all callers.
+
     Args:
         None.
     Returns:
@@ -391,20 +408,63 @@ def _setup_yaml() -> yaml.ruamel.yaml.YAML:
         ]
     )
 
-@memory.cache  # type: ignore
-def extract_stored_data_in_yaml(filename: Union[str, Path],
-                                require_file_to_exist: bool = False) -> analysis_config.DictLike:
+def _file_modification_key(filename: Path) -> Optional[Tuple[int, int]]:
+    """ Determine a key which identifies the current state of a file.
+
+    Args:
+        filename: Path to the file.
+    Returns:
+        The modification time (in ns) and the size of the file, or None if the file doesn't exist.
+    """
+    try:
+        file_stat = filename.stat()
+    except FileNotFoundError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+def extract_stored_data_in_yaml(filename: Union[str, Path], require_file_to_exist: bool = False,
+                                keys: Optional[Iterable[str]] = None) -> analysis_config.DictLike:
     """ Extract data stored in a given YAML file.
 
+    The parsed contents are cached in memory based on the state of the file, so the file is only parsed
+    again if it has been modified since the last time that it was read. The cache is also cleared whenever
+    the file is written through ``_update_yaml_file(...)``, so we don't rely on the resolution of the
+    modification time.
+
     Args:
         filename: Path to the file.
         require_file_to_exist: True if the file must exist (i.e. we will raise an exception if it doesn't exist.
+        keys: Keys of the values to retrieve. Keys which aren't in the file are skipped. If not provided,
+            all of the contents are retrieved. Default: None.
     Returns:
-        Contents of the YAML file. If it doesn't exist, but is not required to do so, it returns an empty dict.
+        Copy of the (selected) contents of the YAML file. If it doesn't exist, but is not required to do so,
+            it returns an empty dict.
     """
     # Validation
     # Convert to a Path if it's not already. If it is already, nothing will happen.
     filename = Path(filename)
+    stored_data = _extract_stored_data_in_yaml(
+        filename = filename, require_file_to_exist = require_file_to_exist,
+        modification_key = _file_modification_key(filename),
+    )
+    # Copy the retrieved values so that the caller can't modify the cache. We only copy the values that
+    # were requested because the file contains the values of every analysis object.
+    if keys is None:
+        return copy.deepcopy(stored_data)
+    return {k: copy.deepcopy(stored_data[k]) for k in keys if k in stored_data}
+
+@functools.lru_cache(maxsize = 8)
+def _extract_stored_data_in_yaml(filename: Path, require_file_to_exist: bool,
+                                 modification_key: Optional[Tuple[int, int]]) -> analysis_config.DictLike:
+    """ Extract data stored in a given YAML file.
+
+    Args:
+        filename: Path to the file.
+        require_file_to_exist: True if the file must exist (i.e. we will raise an exception if it doesn't exist.
+        modification_key: Key which identifies the state of the file. It's only used to key the cache.
+    Returns:
+        Contents of the YAML file. If it doesn't exist, but is not required to do so, it returns an empty dict.
+    """
     # Setup
     y = _setup_yaml()
     logger.debug(f"Reading data from YAML file at {filename}.")
@@ -423,19 +483,19 @@ def extract_stored_data_in_yaml(filename: Union[str, Path],
 
     return stored_data
 
-@memory.cache  # type: ignore
 def extract_hists_from_root_file(filename: Union[str, Path], require_file_to_exist: bool = False) -> Dict[str, Any]:
     """ Extract hists from a ROOT file.
 
+    The hists aren't cached because the output file is rewritten throughout the analysis. Instead,
+    callers which need the hists for multiple analysis objects should retrieve them once and pass
+    them along (see ``Correlations.run_projections(...)``).
+
     Args:
         filename: Path to the file.
         require_file_to_exist: True if the file must exist (i.e. we will raise an exception if it doesn't exist.
     Returns:
         Hists stored in the ROOT file. If it doesn't exist, but is not required to do so, it returns an empty dict.
     """
-    # Validation
-    # Convert to a Path if it's not already. If it is already, nothing will happen.
-    filename = Path(filename)
     try:
         input_hists = histogram.get_histograms_in_file(filename = str(filename))
     except IOError as e:
@@ -448,6 +508,134 @@ def extract_hists_from_root_file(filename: Union[str, Path], require_file_to_exi
 
     return input_hists
 
+def _axis_range_from_values(axis_type: enum.Enum, axis_range_name: str,
+                            value_range: params.SelectedRange) -> HistAxisRange:
+    """ Define an axis range which selects the bins containing the given range of values.
+
+    The bins are found on the axis of the hist that is being projected when the projection is performed,
+    so the same range can be applied to hists with different binning.
+
+    Args:
+        axis_type: Axis to which the range should be applied.
+        axis_range_name: Name of the axis range.
+        value_range: Min and max values of the range.
+    Returns:
+        The axis range.
+    """
+    # We use epsilon to ensure that the values at the bin edges select the bins within the range.
+    return HistAxisRange(
+        axis_type = axis_type,
+        axis_range_name = axis_range_name,
+        min_val = HistAxisRange.apply_func_to_find_bin(ROOT.TAxis.FindBin, value_range.min + epsilon),
+        max_val = HistAxisRange.apply_func_to_find_bin(ROOT.TAxis.FindBin, value_range.max - epsilon),
+    )
+
+def _update_yaml_file(filename: Union[str, Path], values: Mapping[str, Any]) -> None:
+    """ Update the values stored in a YAML file with a single load and dump of the file.
+
+    Args:
+        filename: Path to the file. It will be created if it doesn't exist.
+        values: Values to be stored in the file, keyed by the name under which they will be stored.
+    Returns:
+        None. The values are written to the file.
+    """
+    y = _setup_yaml()
+    logger.debug(f"Writing {len(values)} values to file {filename}")
+    with open(filename, "a+") as f:
+        # We have to open with append so that the file will be created if it doesn't exist,
+        # but won't be automatically overwritten when opened (as occurs for "w"). We then
+        # move back to the beginning of the file so we can read the contents
+        f.seek(0)
+        # We attempt to load any values in the existing file so we can update them.
+        output = y.load(f)
+        # If this is a new file, then the output will be None. We need somewhere to store
+        # the values, so we create an empty dict.
+        if output is None:
+            output = {}
+        # Store the values.
+        output.update(values)
+
+        # Serialize into memory first so the file is written in one go rather than through
+        # the many small writes made by the dumper.
+        buffer = io.StringIO()
+        y.dump(output, buffer)
+
+        # And then clear the file so we can overwrite it, and write the output.
+        # For truncate, see: https://stackoverflow.com/a/2769090
+        f.truncate(0)
+        f.write(buffer.getvalue())
+
+    # The cached contents of the file are now outdated.
+    _extract_stored_data_in_yaml.cache_clear()
+
+@contextlib.contextmanager
+def _write_yaml_output_after(write_output: Callable[[], None]) -> Iterator[None]:
+    """ Write the staged YAML output after a processing step.
+
+    If the step fails, we still attempt to write the values which were already staged so that they aren't
+    lost. However, a failure while writing them is only logged so that it doesn't hide the original exception.
+
+    Args:
+        write_output: Function which writes the staged YAML output.
+    Returns:
+        None. The staged values are written when the context is exited.
+    """
+    try:
+        yield
+    except BaseException:
+        try:
+            write_output()
+        except Exception:
+            logger.exception("Failed to write the staged YAML output while handling a failed step.")
+        raise
+    write_output()
+
+@functools.lru_cache()
+def _delta_phi_region_values(values: Tuple[float, ...], shift: float = 0.0) -> Tuple[float, ...]:
+    """ Convert the delta phi region values specified in the configuration to radians.
+
+    Args:
+        values: Min and max of the region in units of pi.
+        shift: Shift applied to the region after converting it to radians. Default: 0.
+    Returns:
+        Min and max of the region in radians.
+    """
+    # Multiply the values by pi.
+    return tuple(shift + np.pi * val for val in values)
+
+def _delta_phi_region(values: Tuple[float, ...], shift: float = 0.0) -> analysis_objects.AnalysisBin:
+    """ Determine a delta phi region from the values specified in the configuration.
+
+    Only the conversion of the values is cached. Each call returns a new region, so the region of one
+    analysis object is never shared with another.
+
+    Args:
+        values: Min and max of the region in units of pi.
+        shift: Shift applied to the region after converting it to radians. Default: 0.
+    Returns:
+        The delta phi region.
+    """
+    return analysis_objects.AnalysisBin(
+        params.SelectedRange(
+            *_delta_phi_region_values(values = values, shift = shift)
+        )
+    )
+
+def _scale_yield_for_systematic(yield_value: float, scale_uncertainty: float) -> Tuple[float, float]:
+    """ Vary a yield up and down by a scale uncertainty to determine a systematic.
+
+    Note:
+        Scaling the yield is equivalent to scaling the hist and integrating it again because
+        the integral is linear in the bin contents.
+
+    Args:
+        yield_value: Yield over the yield range.
+        scale_uncertainty: Fractional scale uncertainty.
+    Returns:
+        The lower and upper yield systematics. We don't worry about the statistical errors.
+    """
+    return yield_value * (1 - scale_uncertainty), yield_value * (1 + scale_uncertainty)
+
 class Correlations(analysis_objects.JetHReactionPlane):
     """ Main correlations analysis object.
 
@@ -510,21 +698,12 @@ class Correlations(analysis_objects.JetHReactionPlane):
         )
         # These phi values are __not__ for extracting the yield ranges. They are for projecting, fitting, etc.
         # The limits for yield ranges are specified elsewhere in the configuration.
-        near_side_values = self.task_config["deltaPhiRanges"]["nearSide"]
-        # Multiply the values by pi.
-        near_side_values = [np.pi * val for val in near_side_values]
-        self.near_side_phi_region = analysis_objects.AnalysisBin(
-            params.SelectedRange(
-                *near_side_values
-            )
+        self.near_side_phi_region = _delta_phi_region(
+            values = tuple(self.task_config["deltaPhiRanges"]["nearSide"]),
         )
-        away_side_values = self.task_config["deltaPhiRanges"]["awaySide"]
-        # Multiply the values by pi and shift them by pi to the away side.
-        away_side_values = [np.pi + np.pi * val for val in away_side_values]
-        self.away_side_phi_region = analysis_objects.AnalysisBin(
-            params.SelectedRange(
-                *away_side_values
-            )
+        # Shift the values by pi to the away side.
+        self.away_side_phi_region = _delta_phi_region(
+            values = tuple(self.task_config["deltaPhiRanges"]["awaySide"]), shift = np.pi,
         )
 
         # Relevant histograms
@@ -536,18 +715,22 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # This way, we don't need to recalculate as frequently, and we won't have to worry about the right
         # scaling as often.
         self.fit_hist: histogram.Histogram1D
+        background_dominated_eta_range = self.background_dominated_eta_region.range
         self.fit_objects_delta_eta: DeltaEtaFitObjects = DeltaEtaFitObjects(
             near_side = fitting.PedestalForDeltaEtaBackgroundDominatedRegion(
-                fit_options = {"range": self.background_dominated_eta_region.range},
+                fit_options = {"range": background_dominated_eta_range},
                 use_log_likelihood = False,
             ),
             away_side = fitting.PedestalForDeltaEtaBackgroundDominatedRegion(
-                fit_options = {"range": self.background_dominated_eta_region.range},
+                fit_options = {"range": background_dominated_eta_range},
                 use_log_likelihood = False,
             ),
         )
 
         # Other relevant analysis information
+        # The pt range labels are used in a number of titles, so we only generate them once.
+        self._jet_pt_label = labels.jet_pt_range_string(self.jet_pt)
+        self._track_pt_label = labels.track_pt_range_string(self.track_pt)
         self.number_of_triggers: int = 0
         self.mixed_event_scale_uncertainty: float = 0.0
         # Store the normalization and the systematic uncertainty
@@ -560,6 +743,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # Setup YAML
         self.yaml: yaml.ruamel.yaml.YAML
         self._setup_yaml()
+        # Values which are waiting to be written to the YAML output file.
+        self._pending_yaml_output: Dict[str, Any] = {}
+        # Whether the output directory has already been created.
+        self._output_directory_exists = False
 
     def _setup_observables(self) -> None:
         """ Setup the analysis observables.
@@ -571,37 +758,35 @@ class Correlations(analysis_objects.JetHReactionPlane):
         Returns:
             None.
         """
-        # We need a field use with replace to successfully copy the dataclass. We just want a clean copy,
-        # (and apparently using replace is strongly preferred for a dataclass compared to copying)
-        # so we replace the hist (which is already None) with None and we get a copy of the dataclass.
-        self.number_of_triggers_observable: analysis_objects.Observable = dataclasses.replace(
-            _number_of_triggers_histogram_information["number_of_triggers_observable"], hist = None,
-        )
-        # Apparently using dataclass replace to copy and modify a dataclass is preferred to
-        # copying the class and changing a value. So we use the replace function.
+        # We copy the prototypes rather than using ``dataclasses.replace(...)``. ``replace`` reruns ``__init__``
+        # with the fields introspected on each call, which adds up when we create many analysis objects.
+        # The prototypes only store ``None`` for the hist, so a shallow copy is sufficient.
+        self.number_of_triggers_observable: analysis_objects.Observable = copy.copy(
+            _number_of_triggers_histogram_information["number_of_triggers_observable"]
+        )
         self.correlation_hists_2d: CorrelationHistograms2D = CorrelationHistograms2D(
-            raw = dataclasses.replace(
+            raw = _copy_observable(
                 _2d_correlations_histogram_information["correlation_hists_2d.raw"],
                 analysis_identifier = self.identifier
             ),
-            mixed_event = dataclasses.replace(
+            mixed_event = _copy_observable(
                 _2d_correlations_histogram_information["correlation_hists_2d.mixed_event"],
                 analysis_identifier = self.identifier
             ),
-            signal = dataclasses.replace(
+            signal = _copy_observable(
                 _2d_correlations_histogram_information["correlation_hists_2d.signal"],
                 analysis_identifier = self.identifier
             ),
         )
         self.correlation_hists_delta_phi: CorrelationHistogramsDeltaPhi = CorrelationHistogramsDeltaPhi(
-            signal_dominated = dataclasses.replace(
+            signal_dominated = _copy_observable(
                 cast(
                     DeltaPhiSignalDominated,
                     _1d_correlations_histogram_information["correlation_hists_delta_phi.signal_dominated"]
                 ),
                 analysis_identifier = self.identifier,
             ),
-            background_dominated = dataclasses.replace(
+            background_dominated = _copy_observable(
                 cast(
                     DeltaPhiBackgroundDominated,
                     _1d_correlations_histogram_information["correlation_hists_delta_phi.background_dominated"]
@@ -610,50 +795,55 @@ class Correlations(analysis_objects.JetHReactionPlane):
             ),
         )
         self.correlation_hists_delta_eta: CorrelationHistogramsDeltaEta = CorrelationHistogramsDeltaEta(
-            near_side = dataclasses.replace(
+            near_side = _copy_observable(
                 cast(DeltaEtaNearSide, _1d_correlations_histogram_information["correlation_hists_delta_eta.near_side"]),
                 analysis_identifier = self.identifier,
             ),
-            away_side = dataclasses.replace(
+            away_side = _copy_observable(
                 cast(DeltaEtaAwaySide, _1d_correlations_histogram_information["correlation_hists_delta_eta.away_side"]),
                 analysis_identifier = self.identifier,
             ),
         )
         self.correlation_hists_delta_phi_subtracted: CorrelationHistogramsDeltaPhi = CorrelationHistogramsDeltaPhi(
-            signal_dominated = dataclasses.replace(
+            signal_dominated = _copy_observable(
                 cast(
-                    DeltaPhiSignalDominatedSubtracted,
+                    DeltaPhiSignalDominated,
                     _1d_correlations_histogram_information["correlation_hists_delta_phi_subtracted.signal_dominated"]
                 ),
                 analysis_identifier = self.identifier,
             ),
-            background_dominated = dataclasses.replace(
+            background_dominated = _copy_observable(
                 cast(
-                    DeltaPhiBackgroundDominatedSubtracted,
+                    DeltaPhiBackgroundDominated,
                     _1d_correlations_histogram_information["correlation_hists_delta_phi_subtracted.background_dominated"]
                 ),
                 analysis_identifier = self.identifier,
             ),
         )
         self.correlation_hists_delta_eta_subtracted: CorrelationHistogramsDeltaEta = CorrelationHistogramsDeltaEta(
-            near_side = dataclasses.replace(
+            near_side = _copy_observable(
                 cast(
-                    DeltaEtaNearSideSubtracted,
+                    DeltaEtaNearSide,
                     _1d_correlations_histogram_information["correlation_hists_delta_eta_subtracted.near_side"]
                 ),
                 analysis_identifier = self.identifier,
             ),
-            away_side = dataclasses.replace(
+            away_side = _copy_observable(
                 cast(
-                    DeltaEtaAwaySideSubtracted,
+                    DeltaEtaAwaySide,
                     _1d_correlations_histogram_information["correlation_hists_delta_eta_subtracted.away_side"]
                 ),
                 analysis_identifier = self.identifier,
             ),
         )
-        # Yields
+        # Retrieve the values which are used for multiple observables just once.
         # Multiply by pi (the value is defined such that this is expected).
         _delta_phi_yield_limit = self.task_config["delta_phi_yield_limit"] * np.pi
+        _delta_eta_yield_limit = self.task_config["delta_eta_yield_limit"]
+        _near_side_phi_range = self.near_side_phi_region.range
+        _away_side_phi_range = self.away_side_phi_region.range
+        _signal_dominated_eta_range = self.signal_dominated_eta_region.range
+        # Yields
         self.yields_delta_phi: CorrelationYields = CorrelationYields(
             near_side = extracted.ExtractedYield(
                 value = analysis_objects.ExtractedObservable(-1, -1),
@@ -670,19 +860,19 @@ class Correlations(analysis_objects.JetHReactionPlane):
             near_side = extracted.ExtractedYield(
                 value = analysis_objects.ExtractedObservable(-1, -1),
                 central_value = 0,
-                extraction_limit = self.task_config["delta_eta_yield_limit"],
+                extraction_limit = _delta_eta_yield_limit,
             ),
             away_side = extracted.ExtractedYield(
                 value = analysis_objects.ExtractedObservable(-1, -1),
                 central_value = 0,
-                extraction_limit = self.task_config["delta_eta_yield_limit"],
+                extraction_limit = _delta_eta_yield_limit,
             ),
         )
         # Widths
         self.widths_delta_phi: CorrelationWidths = CorrelationWidths(
             near_side = extracted.ExtractedWidth(
                 fit_object = fitting.FitPedestalWithExtendedGaussian(
-                    fit_options = {"range": self.near_side_phi_region.range},
+                    fit_options = {"range": _near_side_phi_range},
                     user_arguments = {
                         "pedestal": 0, "fix_pedestal": True,
                         "mean": 0, "fix_mean": True,
@@ -695,7 +885,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
             ),
             away_side = extracted.ExtractedWidth(
                 fit_object = fitting.FitPedestalWithExtendedGaussian(
-                    fit_options = {"range": self.away_side_phi_region.range},
+                    fit_options = {"range": _away_side_phi_range},
                     user_arguments = {
                         "pedestal": 0, "fix_pedestal": True,
                         "mean": np.pi, "limit_mean": (np.pi / 2, 3 * np.pi / 2), "fix_mean": True,
@@ -713,7 +903,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
         self.widths_delta_eta: CorrelationWidths = CorrelationWidths(
             near_side = extracted.ExtractedWidth(
                 fit_object = fitting.FitPedestalWithExtendedGaussian(
-                    fit_options = {"range": self.signal_dominated_eta_region.range},
+                    fit_options = {"range": _signal_dominated_eta_range},
                     user_arguments = {
                         "mean": 0, "fix_mean": True,
                         "width": 0.15, "limit_width": (0.05, 1.0),
@@ -725,7 +915,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
             ),
             away_side = extracted.ExtractedWidth(
                 fit_object = fitting.FitPedestalWithExtendedGaussian(
-                    fit_options = {"range": self.near_side_phi_region.range},
+                    fit_options = {"range": _near_side_phi_range},
                     user_arguments = {
                         "mean": 0, "fix_mean": True,
                         "width": 0.3, "limit_width": (0.05, 1.5),
@@ -752,13 +942,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
         Returns:
             The observable object, which contains the histogram.
         """
-        all_hists_info: Mapping[str, analysis_objects.Observable] = {
-            **_2d_correlations_histogram_information,
-            **_number_of_triggers_histogram_information,
-            **_1d_correlations_histogram_information,
-        }
-        for attribute_name, observable in all_hists_info.items():
-            yield observable
+        yield from _all_histogram_information.values()
 
     def _write_2d_correlations(self) -> None:
         """ Write 2D correlations to output file. """
@@ -794,30 +978,9 @@ class Correlations(analysis_objects.JetHReactionPlane):
 
     def write_delta_eta_fit_results(self) -> None:
         """ Write delta eta fit results. """
-        y = self._setup_yaml()
-        filename = os.path.join(self.output_prefix, self.output_filename_yaml)
-        with open(filename, "a+") as f:
-            # We have to open with append so that the file will be created if it doesn't exist,
-            # but won't be automatically overwritten when opened (as occurs for "w"). We then
-            # move back to the beginning of the file so we can read the contents
-            f.seek(0)
-            # We attempt to load any histograms in the existing file so we can update them.
-            output = y.load(f)
-            # If this is a new file, then the output will be None. We need somewhere to store
-            # the histograms, so we create an empty dict.
-            if output is None:
-                output = {}
-            # And then move back to beginning of the file and clear it so we can overwrite it.
-            # For truncate, see: https://stackoverflow.com/a/2769090
-            f.truncate(0)
-
-            #logger.debug(f"output: {output}")
-
-            # Store the fit.
-            output[f"{self.identifier}_fit_objects_delta_eta"] = self.fit_objects_delta_eta
-
-            # Finally, write the output
-            y.dump(output, f)
+        self._write_extracted_values_to_YAML(values = {
+            f"{self.identifier}_fit_objects_delta_eta": self.fit_objects_delta_eta,
+        })
 
     def write_yields_to_YAML(self, prefix: str) -> None:
         """ Write yields to YAML. """
@@ -838,116 +1001,146 @@ class Correlations(analysis_objects.JetHReactionPlane):
             f"{self.identifier}_widths_delta_eta": self.widths_delta_eta,
         })
 
-    def _write_extracted_values_to_YAML(self, values: Dict[str, Union[CorrelationWidths, CorrelationYields,
-                                                                      analysis_objects.ExtractedObservable]]) -> None:
-        """ Write extracted values (widths, yields) to YAML. """
-        y = self._setup_yaml()
+    def _write_extracted_values_to_YAML(self, values: Mapping[str, Any]) -> None:
+        """ Write extracted values (widths, yields) to YAML.
+
+        Note:
+            The values are only staged here. They are written to the file by ``write_pending_yaml_output()``,
+            so that we only need to load and dump the YAML file once for many values. The values are staged
+            by reference, so they must not be modified until they are written. This is the case for all of
+            the extracted values because the staged values are written at the end of each step.
+
+        Args:
+            values: Values to be written, keyed by the name under which they will be stored.
+        Returns:
+            None.
+        """
+        self._pending_yaml_output.update(values)
+
+    def pop_pending_yaml_output(self) -> Tuple[str, Dict[str, Any]]:
+        """ Retrieve the staged YAML output, which is then cleared from the analysis object.
+
+        Args:
+            None.
+        Returns:
+            Filename of the YAML output file, values which should be stored in that file.
+        """
         filename = os.path.join(self.output_prefix, self.output_filename_yaml)
-        with open(filename, "a+") as f:
-            # We have to open with append so that the file will be created if it doesn't exist,
-            # but won't be automatically overwritten when opened (as occurs for "w"). We then
-            # move back to the beginning of the file so we can read the contents
-            f.seek(0)
-            # We attempt to load any histograms in the existing file so we can update them.
-            output = y.load(f)
-            # If this is a new file, then the output will be None. We need somewhere to store
-            # the histograms, so we create an empty dict.
-            if output is None:
-                output = {}
-            # And then move back to beginning of the file and clear it so we can overwrite it.
-            # For truncate, see: https://stackoverflow.com/a/2769090
-            f.truncate(0)
-
-            #logger.debug(f"output: {output}")
-
-            # Store the fit.
-            for name, value in values.items():
-                output[name] = value
-
-            # Finally, write the output
-            y.dump(output, f)
+        values, self._pending_yaml_output = self._pending_yaml_output, {}
+        return filename, values
+
+    def write_pending_yaml_output(self) -> None:
+        """ Write all staged values to the YAML output file in a single update of the file.
+
+        Args:
+            None.
+        Returns:
+            None. The staged values are written to the YAML output file.
+        """
+        filename, values = self.pop_pending_yaml_output()
+        # Nothing to be done if nothing has been staged.
+        if values:
+            _update_yaml_file(filename = filename, values = values)
 
     def _write_hists_to_root_file(self, hists: Iterable[Tuple[str, analysis_objects.Observable]],
                                   mode: str = "UPDATE") -> None:
         """ Write the provided histograms to a ROOT file. """
-        filename = os.path.join(self.output_prefix, self.output_filename)
-        directory_name = os.path.dirname(filename)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+        filename = Path(self.output_prefix) / self.output_filename
+        # We only need to create the output directory once.
+        if not self._output_directory_exists:
+            filename.parent.mkdir(parents = True, exist_ok = True)
+            self._output_directory_exists = True
 
         logger.info(f"Saving correlations to {filename}")
         # Then actually iterate through and save the hists.
-        with histogram.RootOpen(filename = filename, mode = mode):
+        with histogram.RootOpen(filename = str(filename), mode = mode):
             for _, observable in hists:
                 hist = observable.hist
                 # Only write the histogram if it's valid. It's possible that it's still ``None``.
-                if hist:
+                if hist is not None:
                     logger.debug(f"Writing hist {hist} with name {observable.name}")
-                    hist.Write(observable.name)
+                    # Overwrite any existing hist with the same name. Otherwise, each run adds another cycle
+                    # of the key, so stale copies accumulate in the file.
+                    hist.Write(observable.name, ROOT.TObject.kOverwrite)
 
     def _write_hists_to_yaml(self, hists: Iterable[Tuple[str, analysis_objects.Observable]],
                              prefix: str = "") -> None:
         """ Write hists to YAML. """
-        y = self._setup_yaml()
-        filename = os.path.join(self.output_prefix, self.output_filename_yaml)
-        logger.debug(f"Writing hists to file {filename}")
-        with open(filename, "a+") as f:
-            # We have to open with append so that the file will be created if it doesn't exist,
-            # but won't be automatically overwritten when opened (as occurs for "w"). We then
-            # move back to the beginning of the file so we can read the contents
-            f.seek(0)
-            # We attempt to load any histograms in the existing file so we can update them.
-            output = y.load(f)
-            # If this is a new file, then the output will be None. We need somewhere to store
-            # the histograms, so we create an empty dict.
-            if output is None:
-                output = {}
-            # And then move back to beginning of the file and clear it so we can overwrite it.
-            # For truncate, see: https://stackoverflow.com/a/2769090
-            f.truncate(0)
-
-            #logger.debug(f"output: {output}")
-
-            # Now look for the histograms to write
-            for _, observable in hists:
-                hist = observable.hist
-                # Only write the histogram if it's valid. It's possible that it's still ``None``.
-                if hist:
-                    #logger.debug(f"Writing hist named {observable.name}: {hist}")
-                    name = observable.name
-                    if prefix:
-                        name = f"{prefix}_{name}"
-                    output[observable.name] = hist
+        values: Dict[str, Any] = {}
+        for _, observable in hists:
+            hist = observable.hist
+            # Only write the histogram if it's valid. It's possible that it's still ``None``.
+            if hist is not None:
+                #logger.debug(f"Writing hist named {observable.name}: {hist}")
+                name = observable.name
+                if prefix:
+                    name = f"{prefix}_{name}"
+                values[observable.name] = hist
+
+        self._write_extracted_values_to_YAML(values = values)
 
-            # Finally, write the output
-            y.dump(output, f)
+    def _load_stored_yaml_values(self, keys: Iterable[str],
+                                 require_file_to_exist: bool = False) -> analysis_config.DictLike:
+        """ Load the given values stored in the YAML output file.
+
+        Note:
+            The parsed file is cached (see ``extract_stored_data_in_yaml(...)``), so retrieving
+            multiple values doesn't require parsing the file multiple times.
 
-    def _init_2d_correlations_hists_from_root_file(self) -> None:
+        Args:
+            keys: Keys of the values to retrieve.
+            require_file_to_exist: True if the file must exist. Default: False.
+        Returns:
+            Copies of the requested values which are stored in the YAML output file, keyed by their keys.
+        """
+        filename = Path(self.output_prefix) / self.output_filename_yaml
+        return extract_stored_data_in_yaml(
+            filename = filename, require_file_to_exist = require_file_to_exist, keys = keys,
+        )
+
+    def _load_stored_root_hists(self, require_file_to_exist: bool = True) -> Dict[str, Any]:
+        """ Load the hists stored in the output ROOT file.
+
+        Args:
+            require_file_to_exist: True if the file must exist. Default: True.
+        Returns:
+            Hists stored in the ROOT file.
+        """
+        # We want to initialize from our saved hists - they will be at the output_prefix.
+        filename = Path(self.output_prefix) / self.output_filename
+        return extract_hists_from_root_file(filename = filename, require_file_to_exist = require_file_to_exist)
+
+    def _init_2d_correlations_hists_from_root_file(self, input_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Initialize 2D correlation hists. """
-        self._init_hists_from_root_file(hists = self.correlation_hists_2d)
+        self._init_hists_from_root_file(hists = self.correlation_hists_2d, input_hists = input_hists)
 
-    def _init_number_of_triggers_hist_from_root_file(self) -> None:
+    def _init_number_of_triggers_hist_from_root_file(self, input_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Initialize number of triggers hists. """
         # This dict construction is a hack, but it's convenient since it mirrors the structure of the other objects.
-        self._init_hists_from_root_file(hists = {"ignore_key": self.number_of_triggers_observable}.items())
+        self._init_hists_from_root_file(
+            hists = {"ignore_key": self.number_of_triggers_observable}.items(), input_hists = input_hists
+        )
         # Then retrieve the number of triggers from the observable.
         self.number_of_triggers = self._determine_number_of_triggers()
 
     def _init_mixed_event_normalization_from_yaml_file(self) -> None:
         """ Initialize the mixed event normalization from file. """
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        stored_data = extract_stored_data_in_yaml(filename = filename)
+        key = f"{self.identifier}_mixed_event_normalization"
+        stored_data = self._load_stored_yaml_values(keys = [key])
         # Load the mixed event info from file.
-        self.mixed_event_normalization = stored_data[f"{self.identifier}_mixed_event_normalization"]
+        self.mixed_event_normalization = stored_data[key]
 
         #logger.debug(
         #    f"{self.identifier}, {self.reaction_plane_orientation}: mixed event norm: {self.mixed_event_normalization}"
         #)
 
-    def _init_1d_correlations_hists_from_root_file(self) -> None:
+    def _init_1d_correlations_hists_from_root_file(self, input_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Initialize 1D correlation hists. """
-        self._init_hists_from_root_file(hists = self.correlation_hists_delta_phi)
-        self._init_hists_from_root_file(hists = self.correlation_hists_delta_eta)
+        # Retrieve the hists once and use them for both sets of observables.
+        if input_hists is None:
+            input_hists = self._load_stored_root_hists()
+        self._init_hists_from_root_file(hists = self.correlation_hists_delta_phi, input_hists = input_hists)
+        self._init_hists_from_root_file(hists = self.correlation_hists_delta_eta, input_hists = input_hists)
 
     def init_1d_subtracted_delta_phi_corerlations_from_file(self, prefix: str) -> None:
         """ Initialize 1D subtracted delta eta correlation hists. """
@@ -959,47 +1152,50 @@ class Correlations(analysis_objects.JetHReactionPlane):
 
     def init_delta_eta_fit_information(self) -> None:
         """ Initialize delta eta fit information from a YAML file. """
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        stored_data = extract_stored_data_in_yaml(filename = filename)
+        key = f"{self.identifier}_fit_objects_delta_eta"
+        stored_data = self._load_stored_yaml_values(keys = [key])
         # Load the fit from file.
-        self.fit_objects_delta_eta = stored_data[f"{self.identifier}_fit_objects_delta_eta"]
+        self.fit_objects_delta_eta = stored_data[key]
 
     def init_yields_from_file(self, prefix: str) -> None:
         """ Initialize yields from a YAML file. """
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        stored_data = extract_stored_data_in_yaml(filename = filename)
+        delta_phi_key = f"{prefix}_{self.identifier}_yields_delta_phi"
+        delta_eta_key = f"{self.identifier}_yields_delta_eta"
+        stored_data = self._load_stored_yaml_values(keys = [delta_phi_key, delta_eta_key])
         # Load the fit from file.
-        self.yields_delta_phi = stored_data[f"{prefix}_{self.identifier}_yields_delta_phi"]
-        self.yields_delta_eta = stored_data[f"{self.identifier}_yields_delta_eta"]
+        self.yields_delta_phi = stored_data[delta_phi_key]
+        self.yields_delta_eta = stored_data[delta_eta_key]
 
     def init_delta_phi_widths_from_file(self, prefix: str) -> None:
         """ Initialize delta phi widths from a YAML file. """
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        stored_data = extract_stored_data_in_yaml(filename = filename)
+        key = f"{prefix}_{self.identifier}_widths_delta_phi"
+        stored_data = self._load_stored_yaml_values(keys = [key])
         # Load the widths from file.
-        self.widths_delta_phi = stored_data[f"{prefix}_{self.identifier}_widths_delta_phi"]
+        self.widths_delta_phi = stored_data[key]
 
     def init_delta_eta_widths_from_file(self) -> None:
         """ Initialize delta eta widths from a YAML file. """
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        stored_data = extract_stored_data_in_yaml(filename = filename)
+        key = f"{self.identifier}_widths_delta_eta"
+        stored_data = self._load_stored_yaml_values(keys = [key])
         # Load the widths from file.
-        self.widths_delta_eta = stored_data[f"{self.identifier}_widths_delta_eta"]
+        self.widths_delta_eta = stored_data[key]
 
     def _init_hists_from_root_file(self, hists: Iterable[Tuple[str, analysis_objects.Observable]],
+                                   input_hists: Optional[Dict[str, Any]] = None,
                                    require_file_to_exist: bool = True) -> None:
         """ Initialize processed histograms from a ROOT file.
 
         Args:
             hists: Histograms to be initialized.
+            input_hists: Hists which were already retrieved from the ROOT file. If not provided, they will
+                be retrieved from the file. Default: None.
             require_file_to_exist: True if the file must exist. Default: True because if we should only be
                 initilizing if we've already run, so the file should exist.
         Returns:
             None. The histograms are stored in the passed observables.
         """
-        # We want to initialize from our saved hists - they will be at the output_prefix.
-        filename = Path(self.output_prefix) / self.output_filename
-        input_hists = extract_hists_from_root_file(filename = filename, require_file_to_exist = require_file_to_exist)
+        if input_hists is None:
+            input_hists = self._load_stored_root_hists(require_file_to_exist = require_file_to_exist)
         for _, observable in hists:
             #logger.debug(f"Looking for hist {observable.name}")
             h = input_hists.get(observable.name, None)
@@ -1021,9 +1217,13 @@ class Correlations(analysis_objects.JetHReactionPlane):
             None. The histograms are stored in the passed observables.
         """
         # We want to initialize from our saved hists - they will be at the output_prefix.
-        filename = Path(self.output_prefix) / self.output_filename_yaml
-        hists_in_file = extract_stored_data_in_yaml(filename = filename, require_file_to_exist = require_file_to_exist)
-        for _, observable in hists:
+        # NOTE: We need the observables multiple times, so we store them in a list.
+        observables = [observable for _, observable in hists]
+        hists_in_file = self._load_stored_yaml_values(
+            keys = [observable.name for observable in observables],
+            require_file_to_exist = require_file_to_exist,
+        )
+        for observable in observables:
             #logger.debug(f"Looking for hist {observable.name}")
             name = observable.name
             if prefix:
@@ -1051,17 +1251,12 @@ class Correlations(analysis_objects.JetHReactionPlane):
         }
 
         # Define common axes
-        # NOTE: The axis will be changed a copy below when necessary (ie for the trigger, since the axes are different).
+        # NOTE: The trigger sparse has different axes, so the trigger axis ranges are defined separately below.
         # Centrality axis
-        centrality_cut_axis = HistAxisRange(
+        centrality_cut_axis = _axis_range_from_values(
             axis_type = sparse_axes.centrality,
             axis_range_name = "centrality",
-            min_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.event_activity.value_range.min + epsilon
-            ),
-            max_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.event_activity.value_range.max - epsilon
-            ),
+            value_range = self.event_activity.value_range,
         )
         # Event plane selection
         if self.reaction_plane_orientation == params.ReactionPlaneOrientation.inclusive:
@@ -1097,26 +1292,16 @@ class Correlations(analysis_objects.JetHReactionPlane):
             **full_axis_range,
         )
         # Jet pt axis
-        jet_pt_axis = HistAxisRange(
+        jet_pt_axis = _axis_range_from_values(
             axis_type = sparse_axes.jet_pt,
             axis_range_name = f"jet_pt{self.jet_pt.min}-{self.jet_pt.max}",
-            min_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.jet_pt.range.min + epsilon
-            ),
-            max_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.jet_pt.range.max - epsilon
-            )
+            value_range = self.jet_pt.range,
         )
         # Track pt axis
-        track_pt_axis = HistAxisRange(
+        track_pt_axis = _axis_range_from_values(
             axis_type = sparse_axes.track_pt,
             axis_range_name = f"track_pt{self.track_pt.min}-{self.track_pt.max}",
-            min_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.track_pt.range.min + epsilon
-            ),
-            max_val = HistAxisRange.apply_func_to_find_bin(
-                ROOT.TAxis.FindBin, self.track_pt.range.max - epsilon
-            )
+            value_range = self.track_pt.range,
         )
 
         ###########################
@@ -1133,14 +1318,24 @@ class Correlations(analysis_objects.JetHReactionPlane):
             projection_name_format = self.number_of_triggers_observable.name,
             projection_information = projection_information
         )
-        # Take advantage of existing centrality and event plane object, but need to copy and modify the axis type
+        # Use the same centrality and event plane selections, but with the trigger sparse axis types.
+        # We create new axis ranges rather than copying the existing ones because copying them is
+        # comparatively expensive (they contain the functions to determine the bins).
         if self.collision_system != params.CollisionSystem.pp:
-            trigger_centrality_cut_axis = copy.deepcopy(centrality_cut_axis)
-            trigger_centrality_cut_axis.axis_type = JetHTriggerSparse.centrality
-            trigger_projector.additional_axis_cuts.append(trigger_centrality_cut_axis)
-        trigger_reaction_plane_orientation_cut_axis = copy.deepcopy(reaction_plane_orientation_cut_axis)
-        trigger_reaction_plane_orientation_cut_axis.axis_type = JetHTriggerSparse.reaction_plane_orientation
-        trigger_projector.additional_axis_cuts.append(trigger_reaction_plane_orientation_cut_axis)
+            trigger_projector.additional_axis_cuts.append(
+                _axis_range_from_values(
+                    axis_type = JetHTriggerSparse.centrality,
+                    axis_range_name = "centrality",
+                    value_range = self.event_activity.value_range,
+                )
+            )
+        trigger_projector.additional_axis_cuts.append(
+            HistAxisRange(
+                axis_type = JetHTriggerSparse.reaction_plane_orientation,
+                axis_range_name = "reaction_plane",
+                **reaction_plane_axis_range,
+            )
+        )
         # No projection dependent cut axes
         trigger_projector.projection_dependent_cut_axes.append([])
         # Projection axis
@@ -1281,13 +1476,38 @@ class Correlations(analysis_objects.JetHReactionPlane):
         """
         self._delta_eta_bin_width = hist_2D.GetYaxis().GetBinWidth(1)
 
-    def setup(self, input_hists: Optional[Dict[str, Any]] = None) -> bool:
-        """ Setup the correlations object. """
+    def setup(self, input_hists: Optional[Dict[str, Any]] = None, retrieve_input_hists: bool = True) -> bool:
+        """ Setup the correlations object.
+
+        Args:
+            input_hists: All histograms in the input file. Default: None - In that case, they will be
+                retrieved automatically.
+            retrieve_input_hists: If True, retrieve the input hists and setup the projectors. They're only
+                needed to generate the 2D correlations, so they can be skipped if the correlations will be
+                loaded from file instead. Default: True.
+        Returns:
+            True if the analysis was successfully setup.
+        """
         # Setup the analysis observables
         self._setup_observables()
+        if not retrieve_input_hists:
+            return True
         # Setup the input hists and projectors
         return super().setup(input_hists = input_hists)
 
+    def should_generate_2d_correlations(self, processing_options: ProcessingOptions) -> bool:
+        """ Determine whether the 2D correlations will be generated from the input hists.
+
+        Args:
+            processing_options: Processing options to configure the projections.
+        Returns:
+            True if the 2D correlations will be generated, or False if they will be loaded from file.
+        """
+        # Only need to check if file exists for this because we cannot get past there without somehow
+        # having some hists
+        file_exists = (Path(self.output_prefix) / self.output_filename).is_file()
+        return processing_options["generate_2D_correlations"] or not file_exists
+
     def _post_creation_processing_for_2d_correlation(self, hist: Hist,
                                                      normalization_factor: float, title_label: str,
                                                      rebin_factors: Optional[Tuple[int, int]] = None) -> None:
@@ -1322,8 +1542,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
             self.output_info,
             # For labeling purposes
             output_name = f"mixed_event_normalization_{self.identifier}", eta_limits = eta_limits,
-            jet_pt_title = labels.jet_pt_range_string(self.jet_pt),
-            track_pt_title = labels.track_pt_range_string(self.track_pt),
+            jet_pt_title = self._jet_pt_label,
+            track_pt_title = self._track_pt_label,
             # Basic data
             lin_space = lin_space, peak_finding_hist_array = peak_finding_hist_array,
             lin_space_rebin = lin_space_rebin, peak_finding_hist_array_rebin = peak_finding_hist_array_rebin,
@@ -1344,8 +1564,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
             self.output_info,
             # For labeling purposes
             output_name = f"simplified_mixed_event_normalization_{self.identifier}", eta_limits = eta_limits,
-            jet_pt_title = labels.jet_pt_range_string(self.jet_pt),
-            track_pt_title = labels.track_pt_range_string(self.track_pt),
+            jet_pt_title = self._jet_pt_label,
+            track_pt_title = self._track_pt_label,
             mixed_event_1D = peak_finding_hist,
             # Moving Average
             max_moving_avg = max_moving_avg,
@@ -1426,23 +1646,22 @@ class Correlations(analysis_objects.JetHReactionPlane):
             title_label = "Correlation",
         )
 
-    def _run_2d_projections(self, processing_options: ProcessingOptions) -> None:
+    def _run_2d_projections(self, processing_options: ProcessingOptions,
+                            stored_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Run the correlations 2D projections.
 
         Args:
             processing_options: Processing options to configure the projections.
+            stored_hists: Hists which were already retrieved from the output ROOT file. If not provided,
+                they will be retrieved from the file if necessary. Default: None.
         Returns:
             None. Projections are stored in output files, and plots may have been created.
         """
-        # Only need to check if file exists for this if statement because we cannot get past there
-        # without somehow having some hists
-        file_exists = os.path.isfile(os.path.join(self.output_prefix, self.output_filename))
-
         # NOTE: Only normalize hists when plotting, and then only do so to a copy!
         #       The exceptions are the 2D correlations, which are normalized by n_trig for the raw correlation
         #       and the maximum efficiency for the mixed events. They are excepted because we don't have a
         #       purpose for such unnormalized hists.
-        if processing_options["generate_2D_correlations"] or not file_exists:
+        if self.should_generate_2d_correlations(processing_options):
             # Create the correlations by utilizing the projectors
             logger.info("Projecting 2D correlations")
             self._create_2d_raw_and_mixed_correlations()
@@ -1461,8 +1680,11 @@ class Correlations(analysis_objects.JetHReactionPlane):
         else:
             # Initialize the 2D correlations from the file
             logger.info(f"Loading 2D correlations and trigger jet spectra from file for {self.identifier}, {self.reaction_plane_orientation}")
-            self._init_2d_correlations_hists_from_root_file()
-            self._init_number_of_triggers_hist_from_root_file()
+            # Retrieve the hists once and use them for both sets of observables.
+            if stored_hists is None:
+                stored_hists = self._load_stored_root_hists()
+            self._init_2d_correlations_hists_from_root_file(input_hists = stored_hists)
+            self._init_number_of_triggers_hist_from_root_file(input_hists = stored_hists)
             self._init_mixed_event_normalization_from_yaml_file()
 
         # At this point, we have the 2D correlations (whether via projection or initializing them from a file),
@@ -1508,27 +1730,19 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # dominated region. Need to do this as projection dependent cuts because it is selecting different
         # ranges on the same axis
         delta_phi_signal_projector.projection_dependent_cut_axes.append([
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_eta,
                 axis_range_name = "negative_eta_signal_dominated",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, -1 * self.signal_dominated_eta_region.max + epsilon,
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, -1 * self.signal_dominated_eta_region.min - epsilon,
+                value_range = params.SelectedRange(
+                    min = -1 * self.signal_dominated_eta_region.max, max = -1 * self.signal_dominated_eta_region.min,
                 ),
             )
         ])
         delta_phi_signal_projector.projection_dependent_cut_axes.append([
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_eta,
                 axis_range_name = "Positive_eta_signal_dominated",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.signal_dominated_eta_region.min + epsilon,
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.signal_dominated_eta_region.max - epsilon,
-                ),
+                value_range = self.signal_dominated_eta_region.range,
             )
         ])
         delta_phi_signal_projector.projection_axes.append(
@@ -1556,27 +1770,19 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # Need to do this as projection dependent cuts because it is selecting different ranges
         # on the same axis
         delta_phi_background_projector.projection_dependent_cut_axes.append([
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_eta,
                 axis_range_name = "negative_eta_background_dominated",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, -1 * self.background_dominated_eta_region.max + epsilon,
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, -1 * self.background_dominated_eta_region.min - epsilon,
+                value_range = params.SelectedRange(
+                    min = -1 * self.background_dominated_eta_region.max, max = -1 * self.background_dominated_eta_region.min,
                 ),
             )
         ])
         delta_phi_background_projector.projection_dependent_cut_axes.append([
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_eta,
                 axis_range_name = "positive_eta_background_dominated",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.background_dominated_eta_region.min + epsilon,
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.background_dominated_eta_region.max - epsilon,
-                ),
+                value_range = self.background_dominated_eta_region.range,
             )
         ])
         delta_phi_background_projector.projection_axes.append(
@@ -1601,15 +1807,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
         )
         # Select near side in delta phi
         delta_eta_ns_projector.additional_axis_cuts.append(
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_phi,
                 axis_range_name = "deltaPhiNearSide",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.near_side_phi_region.min + epsilon
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.near_side_phi_region.max - epsilon
-                ),
+                value_range = self.near_side_phi_region.range,
             )
         )
         # No projection dependent cut axes
@@ -1636,15 +1837,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
         )
         # Select away side in delta phi
         delta_eta_as_projector.additional_axis_cuts.append(
-            HistAxisRange(
+            _axis_range_from_values(
                 axis_type = analysis_objects.CorrelationAxis.delta_phi,
                 axis_range_name = "deltaPhiAwaySide",
-                min_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.away_side_phi_region.min + epsilon
-                ),
-                max_val = HistAxisRange.apply_func_to_find_bin(
-                    ROOT.TAxis.FindBin, self.away_side_phi_region.max - epsilon
-                ),
+                value_range = self.away_side_phi_region.range,
             )
         )
         # No projection dependent cut axes
@@ -1762,16 +1958,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
             track_pt = self.track_pt,
             path = self.task_config["joelsCorrelationsFilePath"]
         )
-        # Define map by hand because it's out of our control.
-        map_to_joels_hist_names = {
-            params.ReactionPlaneOrientation.inclusive: "all",
-            params.ReactionPlaneOrientation.in_plane: "in",
-            params.ReactionPlaneOrientation.mid_plane: "mid",
-            params.ReactionPlaneOrientation.out_of_plane: "out",
-        }
-
         # Example hist name for all orientations: "allReconstructedSignalwithErrorsNOMnosub"
-        joel_hist_name = map_to_joels_hist_names[self.reaction_plane_orientation]
+        joel_hist_name = _map_to_joels_hist_names[self.reaction_plane_orientation]
         joel_hist_name += "ReconstructedSignalwithErrorsNOMnosub"
 
         our_hist = histogram.Histogram1D.from_existing_hist(
@@ -1784,18 +1972,21 @@ class Correlations(analysis_objects.JetHReactionPlane):
             their_hist = comparison_hists[joel_hist_name],
             title = f"Unsubtracted 1D: ${self.correlation_hists_delta_phi.signal_dominated.axis.display_str()}$,"
                     f" {self.reaction_plane_orientation.display_str()} event plane orient.,"
-                    f" {labels.jet_pt_range_string(self.jet_pt)}, {labels.track_pt_range_string(self.track_pt)}",
+                    f" {self._jet_pt_label}, {self._track_pt_label}",
             x_label = r"$\Delta\varphi$",
             y_label = r"$\mathrm{d}N/\mathrm{d}\varphi$",
             output_name = f"jetH_delta_phi_{self.identifier}_joel_comparison_unsub",
             offset_our_points = True,
         )
 
-    def _run_1d_projections(self, processing_options: ProcessingOptions) -> None:
+    def _run_1d_projections(self, processing_options: ProcessingOptions,
+                            stored_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Run the 2D -> 1D projections.
 
         Args:
             processing_options: Processing options to configure the projections.
+            stored_hists: Hists which were already retrieved from the output ROOT file. If not provided,
+                they will be retrieved from the file if necessary. Default: None.
         Returns:
             None. Projections are stored in output files, and plots may have been created.
         """
@@ -1814,7 +2005,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
         else:
             # Initialize the 1D correlations from the file
             logger.info(f"Loading 1D correlations from file for {self.identifier}, {self.reaction_plane_orientation}")
-            self._init_1d_correlations_hists_from_root_file()
+            self._init_1d_correlations_hists_from_root_file(input_hists = stored_hists)
 
         # Plot the correlations
         if processing_options["plot_1D_correlations"]:
@@ -1836,16 +2027,27 @@ class Correlations(analysis_objects.JetHReactionPlane):
             else:
                 logger.info("Skipping comparison with Joel since we're not analyzing the right system.")
 
-    def run_projections(self, processing_options: ProcessingOptions) -> None:
+    def run_projections(self, processing_options: ProcessingOptions,
+                        stored_hists: Optional[Dict[str, Any]] = None) -> None:
         """ Run all analysis steps through projectors.
 
         Args:
             processing_options: Processing options to configure the projections.
+            stored_hists: Hists which were already retrieved from the output ROOT file. They are only used
+                if the correlations are loaded from file. If not provided, they will be retrieved from the
+                file if necessary. Default: None.
         Returns:
             None. `self.ran_projections` is set to true.
         """
-        self._run_2d_projections(processing_options = processing_options)
-        self._run_1d_projections(processing_options = processing_options)
+        # If we load the 2D correlations from file, then we also load the 1D correlations from file
+        # (generating the 2D correlations requires generating the 1D correlations). Nothing is written
+        # to the ROOT file in between, so we only need to retrieve the hists once.
+        # Write out any values that were stored during the projections.
+        with _write_yaml_output_after(self.write_pending_yaml_output):
+            if stored_hists is None and not self.should_generate_2d_correlations(processing_options):
+                stored_hists = self._load_stored_root_hists()
+            self._run_2d_projections(processing_options = processing_options, stored_hists = stored_hists)
+            self._run_1d_projections(processing_options = processing_options, stored_hists = stored_hists)
 
         # Write thesis output file
         if processing_options["write_thesis_output"]:
@@ -1860,18 +2062,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
             track_pt = self.track_pt,
             path = self.task_config["joelsCorrelationsFilePath"]
         )
-        # Define map by hand because it's out of our control.
-        map_to_joels_hist_names = {
-            params.ReactionPlaneOrientation.inclusive: "all",
-            params.ReactionPlaneOrientation.in_plane: "in",
-            params.ReactionPlaneOrientation.mid_plane: "mid",
-            params.ReactionPlaneOrientation.out_of_plane: "out",
-        }
-
         # Example hist name for all orientations fit: "allCombinedFitErrorsClone"
         # Min systematic: allCombinedFitErrorsMIN
         # Max systematic: allCombinedFitErrorsMAX
-        joel_hist_name = map_to_joels_hist_names[self.reaction_plane_orientation]
+        joel_hist_name = _map_to_joels_hist_names[self.reaction_plane_orientation]
         joel_hist_name += "CombinedFitErrorsClone"
 
         self._compare_to_other_hist(
@@ -1879,7 +2073,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
             their_hist = comparison_hists[joel_hist_name],
             title = f"RP {fit_type} fit comparison,"
                     f" {self.reaction_plane_orientation.display_str()} event plane orient.,"
-                    f" {labels.jet_pt_range_string(self.jet_pt)}, {labels.track_pt_range_string(self.track_pt)}",
+                    f" {self._jet_pt_label}, {self._track_pt_label}",
             x_label = r"$\Delta\varphi$",
             y_label = r"$\mathrm{d}N/\mathrm{d}\varphi$",
             output_name = f"jetH_delta_phi_{self.identifier}_joel_comparison_RP_fit",
@@ -1978,27 +2172,33 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # dominated or background dominated portion of the fit.
         signal_dominated = self.correlation_hists_delta_phi.signal_dominated
         signal_dominated_hist = signal_dominated.hist
-        # We copy the fit hist and set the errors to zero when we subtract the histogram because we will
-        # plot the RP fit errors separately.
-        fit_hist_no_errors = self.fit_hist.copy()
-        fit_hist_no_errors.errors_squared = np.zeros(len(fit_hist_no_errors.x))
-        self.correlation_hists_delta_phi_subtracted.signal_dominated.hist = signal_dominated_hist - fit_hist_no_errors
+        # We don't include the fit errors when we subtract the fit because we will plot the RP fit errors
+        # separately. So we only need to subtract the fit values - the errors are those of the signal hist.
+        # NOTE: We operate on the arrays directly, so we need to check the binning explicitly.
+        if not np.allclose(signal_dominated_hist.bin_edges, self.fit_hist.bin_edges):
+            raise ValueError(
+                "Binning of the signal dominated hist and the fit hist don't match."
+                f" Signal dominated bin edges: {signal_dominated_hist.bin_edges},"
+                f" fit hist bin edges: {self.fit_hist.bin_edges}"
+            )
+        fit_values = self.fit_hist.y
+        subtracted_hist = signal_dominated_hist.copy()
+        subtracted_hist.y = signal_dominated_hist.y - fit_values
+        self.correlation_hists_delta_phi_subtracted.signal_dominated.hist = subtracted_hist
         # Store the background errors explicitly in the hist metadata.
         self.correlation_hists_delta_phi_subtracted.signal_dominated.hist.metadata["RPF_background_errors"] = \
             self.fit_hist.errors
         # Calculate the mixed event scale uncertainty
         if self.mixed_event_scale_uncertainty != 0.0:
-            # Scale the fit histogram up or down.
-            fit_hist_scaled_down = self.fit_hist * (1 - self.mixed_event_scale_uncertainty)
-            fit_hist_scaled_up = self.fit_hist * (1 + self.mixed_event_scale_uncertainty)
-
+            # Scale the fit values up or down.
             # When the fit is scaled up and those values are subtracted, it will lead to the lower error
-            subtracted_high = signal_dominated_hist - fit_hist_scaled_down
-            subtracted_low = signal_dominated_hist - fit_hist_scaled_up
-            # We only care about the values, not the statistical errors on the systematics, so we're done.
+            # We only care about the values, not the statistical errors on the systematics, so we only
+            # calculate the subtracted values.
+            subtracted_high = signal_dominated_hist.y - fit_values * (1 - self.mixed_event_scale_uncertainty)
+            subtracted_low = signal_dominated_hist.y - fit_values * (1 + self.mixed_event_scale_uncertainty)
             # We will fill between the values, so we just store the values (not the differences).
             self.correlation_hists_delta_phi_subtracted.signal_dominated.hist.metadata["mixed_event_scale_systematic"] = \
-                (subtracted_low.y, subtracted_high.y)
+                (subtracted_low, subtracted_high)
 
     def compare_subtracted_1d_signal_correlation_to_joel(self) -> None:
         """ Compare subtracted 1D signal correlation hists to Joel.
@@ -2012,16 +2212,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
             track_pt = self.track_pt,
             path = self.task_config["joelsCorrelationsFilePath"]
         )
-        # Define map by hand because it's out of our control.
-        map_to_joels_hist_names = {
-            params.ReactionPlaneOrientation.inclusive: "all",
-            params.ReactionPlaneOrientation.in_plane: "in",
-            params.ReactionPlaneOrientation.mid_plane: "mid",
-            params.ReactionPlaneOrientation.out_of_plane: "out",
-        }
-
         # Example hist name for all orientations: "allReconstructedSignalwithErrorsNOMnosub"
-        joel_hist_name = map_to_joels_hist_names[self.reaction_plane_orientation]
+        joel_hist_name = _map_to_joels_hist_names[self.reaction_plane_orientation]
         joel_hist_name += "ReconstructedSignalwithErrorsNOM"
 
         self._compare_to_other_hist(
@@ -2029,7 +2221,7 @@ class Correlations(analysis_objects.JetHReactionPlane):
             their_hist = comparison_hists[joel_hist_name],
             title = f"Subtracted 1D: ${self.correlation_hists_delta_phi.signal_dominated.axis.display_str()}$,"
                     f" {self.reaction_plane_orientation.display_str()} event plane orient.,"
-                    f" {labels.jet_pt_range_string(self.jet_pt)}, {labels.track_pt_range_string(self.track_pt)}",
+                    f" {self._jet_pt_label}, {self._track_pt_label}",
             x_label = r"$\Delta\varphi$",
             y_label = r"$\mathrm{d}N/\mathrm{d}\varphi$",
             output_name = f"jetH_delta_phi_{self.identifier}_joel_comparison_sub",
@@ -2053,70 +2245,18 @@ class Correlations(analysis_objects.JetHReactionPlane):
             # Retrieve the hist
             correlation_hist = correlation.hist
 
-            # Determine the pedestal representing the background.
-            background_hist = histogram.Histogram1D(
-                bin_edges = correlation_hist.bin_edges,
-                y = fit_object(correlation_hist.x, fit_object.fit_result.values_at_minimum["pedestal"]),
-                errors_squared = fit_object.calculate_errors(x = correlation_hist.x) ** 2,
+            # Subtract the pedestal representing the background and store the output.
+            # We subtract the values directly rather than creating a background hist to subtract.
+            # As for the hist subtraction, the errors are added in quadrature. We start from a copy
+            # so that the metadata of the correlation is preserved.
+            subtracted_hist = correlation_hist.copy()
+            subtracted_hist.y = correlation_hist.y - fit_object(
+                correlation_hist.x, fit_object.fit_result.values_at_minimum["pedestal"]
             )
-
-            # Subtract and store the output
-            subtracted_hist = correlation_hist - background_hist
-            utils.recursive_setattr(self.correlation_hists_delta_eta_subtracted, f"{attribute_name}.hist", subtracted_hist)
-
-    def _extract_mixed_event_systematic_for_yield(self, scale_uncertainty: float, fit_hist: histogram.Histogram1D,
-                                                  yield_range: params.SelectedRange) -> Tuple[float, float]:
-        """ Extract the mixed event scale uncertainty systematic for the yield.
-
-        We vary the fit up and down by the background scale factor. The yield of this gives the upper
-        and lower systematic values. We don't worry about the statistical errors.
-
-        Args:
-            scale_uncertainty: Mixed event scale uncertainty.
-            fit_hist: RP fit histogram.
-            yield_range: Range over which the yield will be extracted.
-        Returns:
-            The lower and upper yield systematics.
-        """
-        # Make a copy to ensure that we don't modify the original values.
-        hist_low = fit_hist * (1 - scale_uncertainty)
-        hist_high = fit_hist * (1 + scale_uncertainty)
-
-        low_yield, _ = hist_low.integral(
-            min_value = yield_range.min + epsilon, max_value = yield_range.max - epsilon,
-        )
-        high_yield, _ = hist_high.integral(
-            min_value = yield_range.min + epsilon, max_value = yield_range.max - epsilon,
-        )
-
-        return low_yield, high_yield
-
-    def _extract_mixed_event_normalization_systematic_for_yield(self, scale_uncertainty: float,
-                                                                hist: histogram.Histogram1D,
-                                                                yield_range: params.SelectedRange) -> Tuple[float, float]:
-        """ Extract the mixed event normalization uncertainty systematic for the yield.
-
-        We scale the hist up and down and calculate the new yield. We don't worry about the statistical errors.
-
-        Args:
-            scale_uncertainty: Mixed event normalization scale uncertainty.
-            hist: Histogram containing the yield of interest.
-            yield_range: Range over which the yield will be extracted.
-        Returns:
-            The lower and upper yield systematics.
-        """
-        # Make a copy to ensure that we don't modify the original values.
-        hist_low = hist * (1 - scale_uncertainty)
-        hist_high = hist * (1 + scale_uncertainty)
-
-        low_yield, _ = hist_low.integral(
-            min_value = yield_range.min + epsilon, max_value = yield_range.max - epsilon,
-        )
-        high_yield, _ = hist_high.integral(
-            min_value = yield_range.min + epsilon, max_value = yield_range.max - epsilon,
-        )
-
-        return low_yield, high_yield
+            subtracted_hist.errors_squared = correlation_hist.errors_squared + fit_object.calculate_errors(
+                x = correlation_hist.x
+            ) ** 2
+            getattr(self.correlation_hists_delta_eta_subtracted, attribute_name).hist = subtracted_hist
 
     def _extract_yield_from_correlation(self, hist: histogram.Histogram1D,
                                         fit_hist: histogram.Histogram1D,
@@ -2145,9 +2285,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
         # Calculate the mixed event systematic yield
         if use_mixed_event_scale_uncertainty:
             # First retrieve the systematic yields
-            systematic_yield_low, systematic_yield_high = self._extract_mixed_event_systematic_for_yield(
+            # We vary the fit yield up and down by the background scale factor.
+            systematic_yield_low, systematic_yield_high = _scale_yield_for_systematic(
+                yield_value = fit_yield_value,
                 scale_uncertainty = self.mixed_event_scale_uncertainty,
-                fit_hist = fit_hist, yield_range = yield_range,
             )
             logger.debug(
                 f"yield: {yield_value}, error: {yield_error}, RP fit: {fit_yield_value}, RP fit error: {fit_yield_error}, mixed event: {(systematic_yield_low, systematic_yield_high)}"
@@ -2158,10 +2299,10 @@ class Correlations(analysis_objects.JetHReactionPlane):
 
         # Check the mixed event normalization uncertainty
         # This difference is so small that we don't store it - just print it.
-        normalization_yield_low, normalization_yield_high = self._extract_mixed_event_normalization_systematic_for_yield(
+        normalization_yield_low, normalization_yield_high = _scale_yield_for_systematic(
+            yield_value = yield_value,
             # We want to pass the fractional change because that's the value that we want to scale with.
             scale_uncertainty = self.mixed_event_normalization.error / self.mixed_event_normalization.value,
-            hist = hist, yield_range = yield_range,
         )
         # Next, subtract the yield background variation from the signal yield.
         # Subtracting the higher yield will lead to the lower yield error value, so we reverse the apparnet labels.
@@ -2261,12 +2402,14 @@ class Correlations(analysis_objects.JetHReactionPlane):
     def _retrieve_widths_from_RPF(self) -> bool:
         """ Helper function to actually extract and store widths from the RP fit. """
         logger.debug("Attempting to extract widths from the RPF fit.")
+        values_at_minimum = self.fit_object.fit_result.values_at_minimum
+        errors_on_parameters = self.fit_object.fit_result.errors_on_parameters
         # Retrieve the widths parameter and it's error
         for attribute_name, width_obj in self.widths_delta_phi:
             # Need to convert "near_side" -> "ns" to retrieve the parameters
-            short_name = "".join([s[0] for s in attribute_name.split("_")])
-            width_value = self.fit_object.fit_result.values_at_minimum.get(f"{self.reaction_plane_orientation}_{short_name}_sigma", None)
-            width_error = self.fit_object.fit_result.errors_on_parameters.get(f"{self.reaction_plane_orientation}_{short_name}_sigma", None)
+            parameter_prefix = f"{self.reaction_plane_orientation}_{_rpf_parameter_short_names[attribute_name]}"
+            width_value = values_at_minimum.get(f"{parameter_prefix}_sigma", None)
+            width_error = errors_on_parameters.get(f"{parameter_prefix}_sigma", None)
             # Only attempt to store the width if we were able to extract it.
             if width_value is None or width_error is None:
                 logger.debug(
@@ -2282,10 +2425,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
             width_obj.fit_args["error_width"] = width_error
 
             # If the widths are there, then the amplitudes are too. We can also take advantage of them to seed the fit.
-            width_obj.fit_args["amplitude"] = \
-                self.fit_object.fit_result.values_at_minimum[f"{self.reaction_plane_orientation}_{short_name}_amplitude"]
-            width_obj.fit_args["error_amplitude"] = \
-                self.fit_object.fit_result.errors_on_parameters[f"{self.reaction_plane_orientation}_{short_name}_amplitude"]
+            width_obj.fit_args["amplitude"] = values_at_minimum[f"{parameter_prefix}_amplitude"]
+            width_obj.fit_args["error_amplitude"] = errors_on_parameters[f"{parameter_prefix}_amplitude"]
 
         return True
 
@@ -2515,8 +2656,8 @@ class Correlations(analysis_objects.JetHReactionPlane):
         path = Path(base_path) / path_to_output
 
         # 2D raw correlation
-        jet_pt_label = labels.jet_pt_range_string(self.jet_pt)
-        track_pt_label = labels.track_pt_range_string(self.track_pt)
+        jet_pt_label = self._jet_pt_label
+        track_pt_label = self._track_pt_label
         event_plane_label = self.reaction_plane_orientation.display_str() + " orientation"
         system_label = fr"{self.event_activity.value_range.min}--{self.event_activity.value_range.max}\% {self.collision_system.value} collisions at ${self.collision_energy.display_str()}$"
         # Fix display in the LaTeX. `\textendash` doesn't seem to render well for whatever reason.
@@ -2578,31 +2719,6 @@ class Correlations(analysis_objects.JetHReactionPlane):
 
     def generate_latex_for_analysis_note(self) -> bool:
         """ Write LaTeX to include plots in the analysis notes. """
-        @dataclass
-        class LaTeXFigure:
-            path: str
-            label: str
-            caption: str
-
-            def generate_figure(self) -> str:
-                """ Generate the LaTeX figure from the provided values. """
-                figure_template = r"""
-                \begin{figure}
-                    \centering
-                    \includegraphics[width=.9\textwidth]{images/%(hist_path)s.eps}
-                    \caption{%(caption)s}
-                    \label{fig:%(label)s}
-                \end{figure}
-                """
-                # Remove the leading spaces
-                figure_template = inspect.cleandoc(figure_template)
-                figure_template = figure_template % {
-                    "hist_path": os.path.join(self.path, self.label), "label": self.label,
-                    "caption": self.caption,
-                }
-
-                return figure_template
-
         raw = LaTeXFigure(
             path = self.output_info.output_prefix,
             label = self.correlation_hists_2d.raw.name,
@@ -2663,6 +2779,10 @@ class CorrelationsManager(analysis_manager.Manager):
         self.analyses: Mapping[Any, Correlations]
         self.selected_iterables: Mapping[str, Sequence[Any]]
         (self.key_index, self.selected_iterables, self.analyses) = self.construct_correlations_from_configuration_file()
+        # The analysis objects don't change after construction, so we only need to determine the items once.
+        self._analyses_items: List[Tuple[Any, Correlations]] = list(
+            analysis_config.iterate_with_selected_objects(self.analyses)
+        )
 
         # Store the fits.
         # We explicitly deselected the reaction plane orientation, because the main fit object doesn't
@@ -2673,6 +2793,8 @@ class CorrelationsManager(analysis_manager.Manager):
         )
         self.fit_objects: Dict[Any, rp_fit.ReactionPlaneFit] = {}
         self.fit_type = self.task_config["reaction_plane_fit"]["fit_type"]
+        # Analysis objects grouped by reaction plane orientation. They're determined when first needed.
+        self._ep_analyses_groups: List[List[Tuple[Any, Correlations]]] = []
 
         # Store the yield ratios, differences. Since they don't depend on particular EP orientations,
         # they don't belong in any particular Correlations object.
@@ -2704,21 +2826,72 @@ class CorrelationsManager(analysis_manager.Manager):
     def setup(self) -> None:
         """ Setup the correlations manager. """
         # Retrieve input histograms (with caching).
-        input_hists: Dict[str, Any] = {}
+        # The input hists are cached by filename so that each input file is only read once,
+        # while still providing the right hists if the analysis objects use different input files.
+        input_hists_cache: Dict[str, Dict[str, Any]] = {}
         with self._progress_manager.counter(total = len(self.analyses),
                                             desc = "Setting up:",
                                             unit = "analysis objects") as setting_up:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
-                # We should now have all RP orientations.
-                # We are effectively caching the values here.
-                if not input_hists:
-                    input_hists = histogram.get_histograms_in_file(filename = analysis.input_filename)
+            for key_index, analysis in self._analyses_items:
                 logger.debug(f"{key_index}")
-                # Setup input histograms and projectors.
-                analysis.setup(input_hists = input_hists)
+                if analysis.should_generate_2d_correlations(self.processing_options):
+                    # We should now have all RP orientations.
+                    input_hists = input_hists_cache.get(analysis.input_filename)
+                    if input_hists is None:
+                        input_hists = histogram.get_histograms_in_file(filename = analysis.input_filename)
+                        input_hists_cache[analysis.input_filename] = input_hists
+                    # Setup input histograms and projectors.
+                    analysis.setup(input_hists = input_hists)
+                else:
+                    # The input hists are only needed to generate the 2D correlations. Since they will be
+                    # loaded from file, we can skip reading the input file (which is expensive).
+                    analysis.setup(retrieve_input_hists = False)
                 # Keep track of progress
                 setting_up.update()
 
+    def _grouped_ep_analyses(self) -> List[List[Tuple[Any, Correlations]]]:
+        """ Retrieve the analysis objects grouped by reaction plane orientation.
+
+        The groups only depend on the analysis objects, which don't change after construction, so we only
+        determine them once and then reuse them for each step.
+
+        Args:
+            None.
+        Returns:
+            Groups of event plane dependent analysis objects, in order.
+        """
+        if not self._ep_analyses_groups:
+            self._ep_analyses_groups = [
+                list(ep_analyses) for ep_analyses in analysis_config.iterate_with_selected_objects_in_order(
+                    analysis_objects = self.analyses,
+                    analysis_iterables = self.selected_iterables,
+                    selection = "reaction_plane_orientation",
+                )
+            ]
+        return self._ep_analyses_groups
+
+    def _write_pending_yaml_output(self) -> None:
+        """ Write the YAML output which has been stored in the analysis objects.
+
+        The analysis objects only stage the values that they want to write, so we write them at the end
+        of each step. Many analysis objects share the same YAML output file, so we collect the values
+        for each file and then write them together. This way, each YAML file only needs to be loaded
+        and dumped once per step rather than once per analysis object.
+
+        Args:
+            None.
+        Returns:
+            None.
+        """
+        output: Dict[str, Dict[str, Any]] = {}
+        for _, analysis in self._analyses_items:
+            filename, values = analysis.pop_pending_yaml_output()
+            output.setdefault(filename, {}).update(values)
+
+        for filename, values in output.items():
+            if values:
+                _update_yaml_file(filename = filename, values = values)
+
     def _plot_triggers(self) -> None:
         """ Plot the EP dependent triggers.
 
@@ -2732,12 +2905,7 @@ class CorrelationsManager(analysis_manager.Manager):
             None.
         """
         if self.processing_options["plot_triggers_EP"]:
-            for ep_analyses in \
-                    analysis_config.iterate_with_selected_objects_in_order(
-                        analysis_objects = self.analyses,
-                        analysis_iterables = self.selected_iterables,
-                        selection = "reaction_plane_orientation",
-                    ):
+            for ep_analyses in self._grouped_ep_analyses():
                 plot_general.trigger_jets_EP(
                     ep_analyses = ep_analyses, output_info = self.output_info
                 )
@@ -2755,16 +2923,17 @@ class CorrelationsManager(analysis_manager.Manager):
         with self._progress_manager.counter(total = len(self.analyses),
                                             desc = "Calculating:",
                                             unit = "systematics") as calculating:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+            for key_index, analysis in self._analyses_items:
                 analysis.calculate_mixed_event_scale_systematic()
                 calculating.update()
 
     def _fit_delta_eta_correlations(self) -> None:
         """ Fit the delta eta correlations. """
-        with self._progress_manager.counter(total = len(self.analyses),
-                                            desc = "Fitting:",
-                                            unit = "delta eta correlations") as fitting:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+        with _write_yaml_output_after(self._write_pending_yaml_output), \
+                self._progress_manager.counter(total = len(self.analyses),
+                                               desc = "Fitting:",
+                                               unit = "delta eta correlations") as fitting:
+            for key_index, analysis in self._analyses_items:
                 if self.processing_options["fit_delta_eta_correlations"]:
                     # Fit a pedestal to the background dominated eta region
                     # The result is stored in the analysis object.
@@ -2820,15 +2989,15 @@ class CorrelationsManager(analysis_manager.Manager):
 
         # Determine the key index for the fit object.
         # We want all iterables except the one that we selected on (the reaction plane orientations).
-        fit_key_index = self.fit_key_index(**{k: v for k, v in key_index if k != "reaction_plane_orientation"})
+        # Those are exactly the fields of the fit key index, so we take them from the analysis key index.
+        fit_key_index = self.fit_key_index(*(getattr(key_index, name) for name in _field_names(self.fit_key_index)))
 
         # Determine the user arguments.
-        user_arguments = self.config["reaction_plane_fit_parameters"].get(f"{self.fit_type}", {}) \
+        fit_parameters = self.config["reaction_plane_fit_parameters"].get(f"{self.fit_type}", {}) \
             .get(inclusive_analysis.jet_pt_identifier, {}) \
-            .get(inclusive_analysis.track_pt_identifier, {}).get("args", {})
-        use_log_likelihood = self.config["reaction_plane_fit_parameters"].get(f"{self.fit_type}", {}) \
-            .get(inclusive_analysis.jet_pt_identifier, {}) \
-            .get(inclusive_analysis.track_pt_identifier, {}).get("use_log_likelihood", False)
+            .get(inclusive_analysis.track_pt_identifier, {})
+        user_arguments = fit_parameters.get("args", {})
+        use_log_likelihood = fit_parameters.get("use_log_likelihood", False)
 
         return input_hists, inclusive_analysis, fit_key_index, user_arguments, use_log_likelihood
 
@@ -2845,11 +3014,13 @@ class CorrelationsManager(analysis_manager.Manager):
             None.
         """
         logger.debug("Full set of components.")
-        #for index, fit_component in self.fit_objects[fit_key_index].components.items():
-        for ep_orientation, fit_component in \
-                self.fit_objects[fit_key_index].create_full_set_of_components(input_hists).items():
-            for key_index, analysis in ep_analyses:
-                if str(key_index.reaction_plane_orientation) in ep_orientation:
+        fit_obj = self.fit_objects[fit_key_index]
+        # Determine the orientation names once rather than for each component.
+        orientations = [(str(key_index.reaction_plane_orientation), analysis) for key_index, analysis in ep_analyses]
+        #for index, fit_component in fit_obj.components.items():
+        for ep_orientation, fit_component in fit_obj.create_full_set_of_components(input_hists).items():
+            for orientation, analysis in orientations:
+                if orientation in ep_orientation:
                     # Store the fit component (and the fit hist for convenience)
                     analysis.fit_object = fit_component
                     # Need the bin edges, so we grab the signal dominated hist.
@@ -2858,10 +3029,12 @@ class CorrelationsManager(analysis_manager.Manager):
                     )
                     analysis.fit_hist = histogram.Histogram1D(
                         bin_edges = binning_hist.bin_edges,
-                        y = fit_component.evaluate_fit(self.fit_objects[fit_key_index].fit_result.x),
+                        y = fit_component.evaluate_fit(fit_obj.fit_result.x),
                         errors_squared = fit_component.fit_result.errors ** 2,
                     )
                     analysis.fit_hist *= analysis.correlation_scale_factor
+                    # Each component corresponds to a single orientation, so there's no need to keep looking.
+                    break
 
     def _plot_reaction_plane_fit(self, fit_obj: rp_fit.ReactionPlaneFit, ep_analyses: List[Tuple[Any, Correlations]],
                                  inclusive_analysis: Correlations) -> None:
@@ -2901,18 +3074,15 @@ class CorrelationsManager(analysis_manager.Manager):
 
     def _reaction_plane_fit(self) -> None:
         """ Fit the delta phi correlations using the reaction plane fit. """
-        number_of_fits = int(len(self.analyses) / len(self.selected_iterables["reaction_plane_orientation"]))
+        number_of_fits = len(self._grouped_ep_analyses())
         with self._progress_manager.counter(total = number_of_fits,
                                             desc = "Reaction plane fitting:",
                                             unit = "associated pt bins") as fitting:
             resolution_parameters = self.config["resolution_parameters"]
+            FitFunction = getattr(three_orientations, self.fit_type)
+            use_minos = self.task_config["reaction_plane_fit"]["use_minos"]
             # To successfully fit, we need all histograms from a given reaction plane orientation.
-            for ep_analyses in \
-                    analysis_config.iterate_with_selected_objects_in_order(
-                        analysis_objects = self.analyses,
-                        analysis_iterables = self.selected_iterables,
-                        selection = "reaction_plane_orientation",
-                    ):
+            for ep_analyses in self._grouped_ep_analyses():
                 # Setup the reaction plane fit inputs
                 input_hists, inclusive_analysis, fit_key_index, \
                     user_arguments, use_log_likelihood = self._setup_reaction_plane_fit_inputs(ep_analyses)
@@ -2922,13 +3092,12 @@ class CorrelationsManager(analysis_manager.Manager):
                     f"Performing RPF for {inclusive_analysis.jet_pt_identifier},"
                     f" {inclusive_analysis.track_pt_identifier}"
                 )
-                FitFunction = getattr(three_orientations, self.fit_type)
                 fit_obj: three_orientations.ReactionPlaneFit = FitFunction(
                     resolution_parameters = resolution_parameters,
                     use_log_likelihood = use_log_likelihood,
                     signal_region = inclusive_analysis.signal_dominated_eta_region,
                     background_region = inclusive_analysis.background_dominated_eta_region,
-                    use_minos = self.task_config["reaction_plane_fit"]["use_minos"],
+                    use_minos = use_minos,
                 )
 
                 # Now, perform the fit (or load in the fit result).
@@ -2996,7 +3165,7 @@ class CorrelationsManager(analysis_manager.Manager):
             # Signal dominated with background function
             # This option is set separately because it's relatively slow.
             if self.processing_options["plot_RPF_signal_background_comparison"]:
-                for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+                for key_index, analysis in self._analyses_items:
                     plot_fit.signal_dominated_with_background_function(analysis)
 
     def _scale_and_convert_hists_post_RPF(self) -> None:
@@ -3004,7 +3173,7 @@ class CorrelationsManager(analysis_manager.Manager):
         with self._progress_manager.counter(total = len(self.analyses),
                                             desc = "Scaling histograms:",
                                             unit = "analyses") as scaling:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+            for key_index, analysis in self._analyses_items:
                 analysis.convert_hists_post_RPF()
                 analysis.scale_hists_post_RPF()
 
@@ -3024,17 +3193,11 @@ class CorrelationsManager(analysis_manager.Manager):
 
     def _subtract_reaction_plane_fits(self) -> None:
         """ Subtract the reaction plane fit from the delta phi correlations."""
-        with self._progress_manager.counter(total = len(self.analyses),
-                                            desc = "Subtracting fit from signal dominated hists:",
-                                            unit = "delta phi hists") as subtracting:
-            for ep_analyses, rp_fit_obj in \
-                    zip(analysis_config.iterate_with_selected_objects_in_order(
-                        analysis_objects = self.analyses,
-                        analysis_iterables = self.selected_iterables,
-                        selection = "reaction_plane_orientation",
-                    ),
-                    self.fit_objects
-                    ):
+        with _write_yaml_output_after(self._write_pending_yaml_output), \
+                self._progress_manager.counter(total = len(self.analyses),
+                                               desc = "Subtracting fit from signal dominated hists:",
+                                               unit = "delta phi hists") as subtracting:
+            for ep_analyses in self._grouped_ep_analyses():
                 # Subtract the background function from the signal dominated hist.
                 inclusive_analysis: Correlations
                 for key_index, analysis in ep_analyses:
@@ -3090,10 +3253,11 @@ class CorrelationsManager(analysis_manager.Manager):
 
     def _subtract_delta_eta_fits(self) -> None:
         """ Subtract the fits from the delta eta correlations. """
-        with self._progress_manager.counter(total = len(self.analyses),
-                                            desc = "Subtracting:",
-                                            unit = "delta eta correlations") as subtracting:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+        with _write_yaml_output_after(self._write_pending_yaml_output), \
+                self._progress_manager.counter(total = len(self.analyses),
+                                               desc = "Subtracting:",
+                                               unit = "delta eta correlations") as subtracting:
+            for key_index, analysis in self._analyses_items:
                 if self.processing_options["subtract_correlations"]:
                     # Fit a pedestal to the background dominated eta region
                     # The result is stored in the analysis object.
@@ -3144,14 +3308,7 @@ class CorrelationsManager(analysis_manager.Manager):
         path = Path(base_path) / path_to_output
 
         figures = []
-        for ep_analyses, (key_index, rp_fit_obj) in zip(
-            analysis_config.iterate_with_selected_objects_in_order(
-                analysis_objects = self.analyses,
-                analysis_iterables = self.selected_iterables,
-                selection = "reaction_plane_orientation",
-            ),
-            self.fit_objects
-        ):
+        for ep_analyses in self._grouped_ep_analyses():
             first_analysis: Correlations
             for key_index, analysis in ep_analyses:
                 first_analysis = analysis
@@ -3215,10 +3372,11 @@ class CorrelationsManager(analysis_manager.Manager):
 
     def extract_yields(self) -> bool:
         """ Extract yields from analysis objects. """
-        with self._progress_manager.counter(total = len(self.analyses),
-                                            desc = "Extractin' yields:",
-                                            unit = "delta phi hists") as extracting:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+        with _write_yaml_output_after(self._write_pending_yaml_output), \
+                self._progress_manager.counter(total = len(self.analyses),
+                                               desc = "Extractin' yields:",
+                                               unit = "delta phi hists") as extracting:
+            for key_index, analysis in self._analyses_items:
                 # Ensure that the previous step was run
                 if not analysis.ran_post_fit_processing:
                     raise RuntimeError("Must run the post fit processing step before extracting yields!")
@@ -3376,6 +3534,7 @@ class CorrelationsManager(analysis_manager.Manager):
                 #covariance_term = np.sqrt(covariance_term)
 
                 # Calculate the error
+                import IPython
                 IPython.embed()
                 fit_error = yield_ratio * np.sqrt(
                     (numerator_yield_obj.value.metadata["fit_error"] / numerator_yield_obj.value.value) ** 2
@@ -3447,16 +3606,11 @@ class CorrelationsManager(analysis_manager.Manager):
     def yield_ratios(self) -> bool:
         """ Calculate yield ratios. """
         # 2 * the number because we extract both out/in and mid/in.
-        n_steps = 2 * int(len(self.analyses) / len(self.selected_iterables["reaction_plane_orientation"]))
+        n_steps = 2 * len(self._grouped_ep_analyses())
         with self._progress_manager.counter(total = n_steps,
                                             desc = "Extractin' yield ratios:",
                                             unit = "associated pt bins") as extracting:
-            for ep_analyses in \
-                    analysis_config.iterate_with_selected_objects_in_order(
-                        analysis_objects = self.analyses,
-                        analysis_iterables = self.selected_iterables,
-                        selection = "reaction_plane_orientation",
-                    ):
+            for ep_analyses in self._grouped_ep_analyses():
                 # Setup
                 analyses = {}
                 for key_index, analysis in ep_analyses:
@@ -3614,16 +3768,11 @@ class CorrelationsManager(analysis_manager.Manager):
     def yield_differences(self) -> bool:
         """ Calculate yield differences. """
         # 2 * the number because we extract both out/in and mid/in.
-        n_steps = 2 * int(len(self.analyses) / len(self.selected_iterables["reaction_plane_orientation"]))
+        n_steps = 2 * len(self._grouped_ep_analyses())
         with self._progress_manager.counter(total = n_steps,
                                             desc = "Extractin' yield differences:",
                                             unit = "associated pt bins") as extracting:
-            for ep_analyses in \
-                    analysis_config.iterate_with_selected_objects_in_order(
-                        analysis_objects = self.analyses,
-                        analysis_iterables = self.selected_iterables,
-                        selection = "reaction_plane_orientation",
-                    ):
+            for ep_analyses in self._grouped_ep_analyses():
                 # Setup
                 analyses = {}
                 for key_index, analysis in ep_analyses:
@@ -3697,10 +3846,11 @@ class CorrelationsManager(analysis_manager.Manager):
 
     def extract_widths(self) -> bool:
         """ Extract widths from analysis objects. """
-        with self._progress_manager.counter(total = len(self.analyses),
-                                            desc = "Extractin' widths:",
-                                            unit = "delta phi hists") as extracting:
-            for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
+        with _write_yaml_output_after(self._write_pending_yaml_output), \
+                self._progress_manager.counter(total = len(self.analyses),
+                                               desc = "Extractin' widths:",
+                                               unit = "delta phi hists") as extracting:
+            for key_index, analysis in self._analyses_items:
                 # Ensure that the previous step was run
                 if not analysis.ran_post_fit_processing:
                     raise RuntimeError("Must run the post fit processing step before extracting widths!")
@@ -3798,8 +3948,22 @@ class CorrelationsManager(analysis_manager.Manager):
             with self._progress_manager.counter(total = len(self.analyses),
                                                 desc = "Projecting:",
                                                 unit = "analysis objects") as projecting:
-                for key_index, analysis in analysis_config.iterate_with_selected_objects(self.analyses):
-                    analysis.run_projections(processing_options = self.processing_options)
+                # The analysis objects share the output ROOT file, so we retrieve the stored hists once per file.
+                # Each analysis object only writes its own hists, so the hists that another analysis object
+                # needs are still valid after an analysis object has written to the file.
+                stored_hists: Dict[Path, Dict[str, Any]] = {}
+                for key_index, analysis in self._analyses_items:
+                    analysis_stored_hists = None
+                    if not analysis.should_generate_2d_correlations(self.processing_options):
+                        filename = Path(analysis.output_prefix) / analysis.output_filename
+                        if filename not in stored_hists:
+                            stored_hists[filename] = extract_hists_from_root_file(
+                                filename = filename, require_file_to_exist = True,
+                            )
+                        analysis_stored_hists = stored_hists[filename]
+                    analysis.run_projections(
+                        processing_options = self.processing_options, stored_hists = analysis_stored_hists,
+                    )
                     # Keep track of progress
                     projecting.update()
             overall_progress.update()
@@ -3892,6 +4056,9 @@ def run_from_terminal() -> CorrelationsManager:
     # Quiet down IPython.
     logging.getLogger("parso").setLevel(logging.INFO)
     # Embed IPython to allow for some additional exploration
+    # NOTE: IPython is only imported here because it's rather slow to import, and we don't want to pay
+    #       that cost whenever the module is imported.
+    import IPython
     IPython.embed()
 
     # Return the manager for convenience.
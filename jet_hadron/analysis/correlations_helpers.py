@@ -5,6 +5,7 @@
 .. codeauthor:: Raymond Ehlers <raymond.ehlers@cern.ch>, Yale University
 """
 
+import functools
 import logging
 import numpy as np
 import os
@@ -403,10 +404,24 @@ def get_joels_comparison_hists(track_pt: analysis_objects.TrackPtBin, path: str)
     if track_pt.min >= 5.0:
         comparison_filename = comparison_filename.replace("X2bg", "X2bgL")
     comparison_filename = os.path.join(path, comparison_filename)
-    comparison_hists = histogram.get_histograms_in_file(filename = comparison_filename)
+    comparison_hists = _get_reference_histograms_in_file(filename = comparison_filename)
 
     return comparison_hists
 
+@functools.lru_cache()
+def _get_reference_histograms_in_file(filename: str) -> Dict[str, Any]:
+    """ Get the histograms stored in a reference file.
+
+    The reference files don't change, so we cache the histograms to avoid reading the same file
+    for each analysis object and comparison. Consequently, the returned hists must not be modified.
+
+    Args:
+        filename: Path to the reference file.
+    Returns:
+        Histograms that are stored in the file.
+    """
+    return histogram.get_histograms_in_file(filename = filename)
+
 def calculate_systematic_2D(nominal: Hist, variation: Hist, signal_dominated: analysis_objects.AnalysisBin,
                             background_dominated: analysis_objects.AnalysisBin) -> float:
     """ Calculate a systematic in 2D.
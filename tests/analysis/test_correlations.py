@@ -7,8 +7,167 @@ By necessity, these won't be extensive, but we can cover some functionality.
 .. codeauthor:: Raymond Ehlers <raymond.ehlers@cern.ch>, Yale University
 """
 
-import pytest  # noqa: F401
+import logging
+import numpy as np
+import os
+import pytest
 
-from jet_hadron.analysis import correlations  # noqa: F401
+from pachyderm import histogram
+from pachyderm.utils import epsilon
 
-# Nothing to test at the moment due to refactoring.
+from jet_hadron.base import params
+from jet_hadron.analysis import correlations
+
+logger = logging.getLogger(__name__)
+
+@pytest.mark.parametrize("observable, field_name, value, expected_name", [
+    (correlations.DeltaPhiSignalDominated(hist = None), "analysis_identifier", "other",
+     "jetH_delta_phi_other_signal_dominated"),
+    (correlations.DeltaPhiSignalDominated(hist = None), "subtracted", True,
+     "jetH_delta_phi_jetPt_20_40_trackPt_1_2_signal_dominated_subtracted"),
+    (correlations.CorrelationObservable2D(hist = None, type = "raw"), "type", "signal",
+     "jetH_delta_eta_delta_phi_jetPt_20_40_trackPt_1_2_signal"),
+], ids = ["1D identifier", "1D subtracted", "2D type"])
+def test_observable_name_after_copy(logging_mixin, observable, field_name, value, expected_name):
+    """ Test that the name of a copied observable follows changes to its fields. """
+    copied = correlations._copy_observable(observable, analysis_identifier = "jetPt_20_40_trackPt_1_2")
+    assert "jetPt_20_40_trackPt_1_2" in copied.name
+
+    setattr(copied, field_name, value)
+
+    assert copied.name == expected_name
+    # The prototype shouldn't be affected.
+    assert "{analysis_identifier}" in observable.name
+
+# Names of the 1D observables, as they were defined by the previous ``*Subtracted`` observable classes.
+# They are used to name the stored hists, so they must not change.
+_1d_observable_names = [
+    ("correlation_hists_delta_phi.signal_dominated", "jetH_delta_phi_{identifier}_signal_dominated"),
+    ("correlation_hists_delta_phi.background_dominated", "jetH_delta_phi_{identifier}_background_dominated"),
+    ("correlation_hists_delta_phi_subtracted.signal_dominated",
+     "jetH_delta_phi_{identifier}_signal_dominated_subtracted"),
+    ("correlation_hists_delta_phi_subtracted.background_dominated",
+     "jetH_delta_phi_{identifier}_background_dominated_subtracted"),
+    ("correlation_hists_delta_eta.near_side", "jetH_delta_eta_{identifier}_near_side"),
+    ("correlation_hists_delta_eta.away_side", "jetH_delta_eta_{identifier}_away_side"),
+    ("correlation_hists_delta_eta_subtracted.near_side", "jetH_delta_eta_{identifier}_near_side_subtracted"),
+    ("correlation_hists_delta_eta_subtracted.away_side", "jetH_delta_eta_{identifier}_away_side_subtracted"),
+]
+
+@pytest.mark.parametrize("attribute_name, expected_name", _1d_observable_names,
+                         ids = [attribute_name for attribute_name, _ in _1d_observable_names])
+def test_1d_observable_names(logging_mixin, attribute_name, expected_name):
+    """ Test that the 1D observable names are the same as those of the previous observable classes. """
+    identifier = "jetPt_20_40_trackPt_1_2"
+    prototype = correlations._1d_correlations_histogram_information[attribute_name]
+
+    # The prototype name is only a template.
+    assert prototype.name == expected_name.format(identifier = "{analysis_identifier}")
+    observable = correlations._copy_observable(prototype, analysis_identifier = identifier)
+    assert observable.name == expected_name.format(identifier = identifier)
+
+@pytest.mark.parametrize("attribute_name", [attribute_name for attribute_name, _ in _1d_observable_names])
+def test_1d_observable_yaml_round_trip(logging_mixin, dump_to_string_and_retrieve, attribute_name):
+    """ Test writing 1D observables to and reading them from YAML. """
+    observable = correlations._copy_observable(
+        correlations._1d_correlations_histogram_information[attribute_name],
+        analysis_identifier = "jetPt_20_40_trackPt_1_2",
+    )
+    result = dump_to_string_and_retrieve(input_object = observable, y = correlations._setup_yaml())
+
+    assert type(result) is type(observable)
+    assert result == observable
+    assert result.subtracted == observable.subtracted
+    assert result.name == observable.name
+    # Only the fields should be stored.
+    assert set(vars(result)) == set(correlations._field_names(type(observable)))
+
+@pytest.mark.parametrize("scale_uncertainty", [0.05, 0.2], ids = ["5%", "20%"])
+def test_yield_systematic_from_scaled_integral(logging_mixin, scale_uncertainty):
+    """ Test that scaling the yield is equivalent to extracting the yield from a scaled hist.
+
+    The yield systematics are determined by scaling the nominal yield, which relies on this equivalence.
+    """
+    bin_edges = np.linspace(-np.pi / 2, 3 * np.pi / 2, 37)
+    x = (bin_edges[1:] + bin_edges[:-1]) / 2
+    hist = histogram.Histogram1D(bin_edges = bin_edges, y = 2 + np.cos(x), errors_squared = np.ones(len(x)))
+    yield_range = params.SelectedRange(min = -np.pi / 3, max = np.pi / 3)
+
+    def extract_yield(h: histogram.Histogram1D) -> float:
+        value, _ = h.integral(min_value = yield_range.min + epsilon, max_value = yield_range.max - epsilon)
+        return value
+
+    low, high = correlations._scale_yield_for_systematic(
+        yield_value = extract_yield(hist), scale_uncertainty = scale_uncertainty,
+    )
+
+    assert np.isclose(low, extract_yield(hist * (1 - scale_uncertainty)))
+    assert np.isclose(high, extract_yield(hist * (1 + scale_uncertainty)))
+
+def test_stored_yaml_data_cache(logging_mixin, tmp_path):
+    """ Test retrieving values from the cached YAML output file. """
+    filename = tmp_path / "output.yaml"
+    correlations._update_yaml_file(filename = filename, values = {"a": [1, 2], "b": 3})
+
+    stored_data = correlations.extract_stored_data_in_yaml(filename = filename, keys = ["a", "c"])
+    # Only the requested values which are in the file are retrieved.
+    assert stored_data == {"a": [1, 2]}
+
+    # The retrieved values are copies, so modifying them shouldn't modify the cached values.
+    stored_data["a"].append(5)
+    assert correlations.extract_stored_data_in_yaml(filename = filename, keys = ["a"]) == {"a": [1, 2]}
+
+    # Updating the file must invalidate the cache, even if the state of the file appears to be unchanged.
+    # For this check, we keep the size the same and restore the modification time.
+    file_stat = filename.stat()
+    correlations._update_yaml_file(filename = filename, values = {"a": [3, 4]})
+    os.utime(filename, ns = (file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert filename.stat().st_size == file_stat.st_size
+    assert correlations.extract_stored_data_in_yaml(filename = filename) == {"a": [3, 4], "b": 3}
+
+def test_staging_and_writing_yaml_output(logging_mixin, tmp_path):
+    """ Test that extracted values are staged and then written to the YAML output file together. """
+    # Constructing the full analysis object requires a full configuration, so we only setup what's needed
+    # for staging and writing the values.
+    analysis = correlations.Correlations.__new__(correlations.Correlations)
+    analysis._pending_yaml_output = {}
+    analysis.output_prefix = str(tmp_path)
+    analysis.output_filename_yaml = "output.yaml"
+    filename = tmp_path / "output.yaml"
+
+    analysis._write_extracted_values_to_YAML(values = {"a": 1})
+    analysis._write_extracted_values_to_YAML(values = {"b": 2})
+    # Nothing is written until the staged values are flushed.
+    assert not filename.exists()
+
+    analysis.write_pending_yaml_output()
+
+    assert correlations.extract_stored_data_in_yaml(filename = filename) == {"a": 1, "b": 2}
+    # The staged values should have been cleared.
+    assert analysis.pop_pending_yaml_output() == (str(filename), {})
+
+@pytest.mark.parametrize("step_fails, write_fails", [
+    (False, False),
+    (True, False),
+    (True, True),
+], ids = ["Successful step", "Failed step", "Failed step and write"])
+def test_write_yaml_output_after_step(logging_mixin, step_fails, write_fails):
+    """ Test writing the staged YAML output after a step, including when the step fails. """
+    written = []
+
+    def write_output() -> None:
+        written.append(True)
+        if write_fails:
+            raise IOError("Write failed")
+
+    if step_fails:
+        # The exception from the step must propagate, even if writing the output fails.
+        with pytest.raises(ValueError, match = "Step failed"):
+            with correlations._write_yaml_output_after(write_output):
+                raise ValueError("Step failed")
+    else:
+        with correlations._write_yaml_output_after(write_output):
+            pass
+
+    # The staged values should always be written once.
+    assert written == [True]